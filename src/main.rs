@@ -1830,13 +1830,23 @@ fn strip_spaces_from_path(base: &Path, full: &Path) -> PathBuf {
 
 // ── Wildcard pattern matching ──────────────────────────────────────────
 
-/// Match a name against a pattern that may contain `*` (any chars) and `?`
-/// (single char) wildcards.  Matching is case-insensitive and only ever
-/// applied to a single path component (file or directory name).
-fn wildcard_matches(pattern: &str, name: &str) -> bool {
-    let p: Vec<char> = pattern.to_lowercase().chars().collect();
-    let n: Vec<char> = name.to_lowercase().chars().collect();
-    wildcard_match_inner(&p, &n)
+/// Lower-case a pattern or name and split it into chars.  Patterns are
+/// prepared once per transfer rather than once per name they are tested
+/// against.
+fn lowered_chars(s: &str) -> Vec<char> {
+    s.to_lowercase().chars().collect()
+}
+
+/// Match a name against patterns (prepared with `lowered_chars`) that may
+/// contain `*` (any chars) and `?` (single char) wildcards.  Matching is
+/// case-insensitive and only ever applied to a single path component (file
+/// or directory name).  The name is lowered once, not once per pattern.
+fn matches_any_wildcard(patterns: &[Vec<char>], name: &str) -> bool {
+    if patterns.is_empty() {
+        return false;
+    }
+    let n = lowered_chars(name);
+    patterns.iter().any(|p| wildcard_match_inner(p, &n))
 }
 
 fn wildcard_match_inner(pattern: &[char], name: &[char]) -> bool {
@@ -1877,16 +1887,16 @@ fn collect_files(
                 .cloned()
                 .collect();
             // Wildcard directory patterns: "~/pattern" → "pattern"
-            let wildcard_dirs: Vec<String> = patterns
+            let wildcard_dirs: Vec<Vec<char>> = patterns
                 .iter()
                 .filter(|p| p.starts_with("~/"))
-                .map(|p| p[2..].to_string())
+                .map(|p| lowered_chars(&p[2..]))
                 .collect();
             // Wildcard file patterns: "~pattern" (but not "~/...")
-            let wildcard_files: Vec<String> = patterns
+            let wildcard_files: Vec<Vec<char>> = patterns
                 .iter()
                 .filter(|p| p.starts_with('~') && !p.starts_with("~/"))
-                .map(|p| p[1..].to_string())
+                .map(|p| lowered_chars(&p[1..]))
                 .collect();
 
             let src_dir = src_dir.clone();
@@ -1903,7 +1913,7 @@ fn collect_files(
                         excluded_dir_count.set(excluded_dir_count.get() + 1);
                         return false;
                     }
-                    if wildcard_dirs.iter().any(|pat| wildcard_matches(pat, &name)) {
+                    if matches_any_wildcard(&wildcard_dirs, &name) {
                         excluded_dir_count.set(excluded_dir_count.get() + 1);
                         return false;
                     }
@@ -1915,7 +1925,7 @@ fn collect_files(
                     Ok(e) if e.file_type().is_file() => {
                         let name = e.file_name().to_string_lossy().to_string();
                         if excluded_files.contains(&name)
-                            || wildcard_files.iter().any(|pat| wildcard_matches(pat, &name))
+                            || matches_any_wildcard(&wildcard_files, &name)
                         {
                             excluded_file_count += 1;
                         } else {
@@ -2758,15 +2768,15 @@ fn collect_remote_files(
         .filter(|p| !p.starts_with('/') && !p.starts_with('~'))
         .cloned()
         .collect();
-    let wildcard_dirs: Vec<String> = patterns
+    let wildcard_dirs: Vec<Vec<char>> = patterns
         .iter()
         .filter(|p| p.starts_with("~/"))
-        .map(|p| p[2..].to_string())
+        .map(|p| lowered_chars(&p[2..]))
         .collect();
-    let wildcard_files: Vec<String> = patterns
+    let wildcard_files: Vec<Vec<char>> = patterns
         .iter()
         .filter(|p| p.starts_with('~') && !p.starts_with("~/"))
-        .map(|p| p[1..].to_string())
+        .map(|p| lowered_chars(&p[1..]))
         .collect();
 
     let remote_base_slash = format!("{}/", remote_base.trim_end_matches('/'));
@@ -2802,7 +2812,7 @@ fn collect_remote_files(
         let mut dir_excluded = false;
         for part in &parts[..parts.len().saturating_sub(1)] {
             if excluded_dirs.contains(*part)
-                || wildcard_dirs.iter().any(|pat| wildcard_matches(pat, part))
+                || matches_any_wildcard(&wildcard_dirs, part)
             {
                 dir_excluded = true;
                 excluded_dir_names.insert(part.to_string());
@@ -2815,7 +2825,7 @@ fn collect_remote_files(
 
         // Check file exclusions
         if excluded_files.contains(*filename)
-            || wildcard_files.iter().any(|pat| wildcard_matches(pat, filename))
+            || matches_any_wildcard(&wildcard_files, filename)
         {
             excluded_file_count += 1;
             continue;
@@ -23,18 +23,34 @@ Environment variables (all optional — remote tests are skipped if unset):
                                   project root.
 """
 
+import functools
 import hashlib
 import json
+import mmap
 import os
 import platform
+import re
 import shutil
 import subprocess
 import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
+try:  # optional, faster JSON parser; the stdlib is used when it is absent
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:  # POSIX only; used for reflink clones of fixture trees
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 # ── Locate the binary ──────────────────────────────────────────────────
 
@@ -53,11 +69,18 @@ REMOTE_PATH = os.environ.get("KOSMOKOPY_TEST_REMOTE_PATH")
 REMOTE_HOST2 = os.environ.get("KOSMOKOPY_TEST_REMOTE_HOST2")
 REMOTE_PATH2 = os.environ.get("KOSMOKOPY_TEST_REMOTE_PATH2")
 SOURCE_DIR = os.environ.get("KOSMOKOPY_TEST_SOURCE_DIR")
-
-# SSH control-socket args — mirrors what the app uses
+COLD_CACHE = os.environ.get("KOSMOKOPY_COLD_CACHE") == "1"
+
+# SSH control-socket args — mirrors what the app uses.  Under pytest-xdist
+# each worker gets its own socket (and master), so one worker finishing
+# and closing its master cannot cut off the others.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")
+SSH_CONTROL_PATH = "/tmp/kosmokopy_test_ssh_{}%h_%p_%r".format(
+    _XDIST_WORKER + "_" if _XDIST_WORKER else "",
+)
 SSH_CTL = [
     "-o", "ControlMaster=auto",
-    "-o", "ControlPath=/tmp/kosmokopy_test_ssh_%h_%p_%r",
+    "-o", "ControlPath=" + SSH_CONTROL_PATH,
     "-o", "ControlPersist=60",
 ]
 
@@ -125,18 +148,9 @@ def run_kosmokopy(
         for pat in exclude:
             cmd += ["--exclude", pat]
 
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-    # Parse the JSON line from stdout
-    stdout = result.stdout.strip()
-    if stdout:
-        return json.loads(stdout)
-
-    # Fallback — binary failed without producing JSON
-    return {
-        "status": "error",
-        "message": f"exit code {result.returncode}: {result.stderr.strip()}",
-    }
+    with tempfile.TemporaryFile() as errlog:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errlog)
+        return _collect_result(proc, errlog, timeout=120)
 
 
 def run_kosmokopy_with_cancel(
@@ -184,15 +198,45 @@ def run_kosmokopy_with_cancel(
         for pat in exclude:
             cmd += ["--exclude", pat]
 
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    time.sleep(cancel_after)
-    proc.send_signal(signal.SIGINT)
-    stdout, stderr = proc.communicate(timeout=30)
+    with tempfile.TemporaryFile() as errlog:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errlog)
+        time.sleep(cancel_after)
+        proc.send_signal(signal.SIGINT)
+        return _collect_result(proc, errlog, timeout=30)
 
-    stdout = stdout.strip()
-    if stdout:
-        return json.loads(stdout)
 
+def _collect_result(proc, errlog, timeout):
+    """
+    Wait for *proc* and parse the last non-empty stdout line as the JSON
+    result.  Only that line is kept, and it is parsed as raw bytes without
+    decoding; stderr goes to *errlog* (a binary temp file) and is read
+    back only if no JSON was produced.
+    """
+    timed_out = []
+
+    def _kill():
+        timed_out.append(True)
+        proc.kill()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    try:
+        last = None
+        for line in proc.stdout:
+            last = line.strip() or last
+        proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    if timed_out:
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+
+    if last:
+        return _json_loads(last)
+
+    # Fallback — binary failed without producing JSON
+    errlog.seek(0)
+    stderr = errlog.read().decode(errors="replace")
     return {
         "status": "error",
         "message": f"exit code {proc.returncode}: {stderr.strip()}",
@@ -201,130 +245,706 @@ def run_kosmokopy_with_cancel(
 
 # ── Helpers ─────────────────────────────────────────────────────────────
 
+# Fixture file contents only need to be incompressible and distinct, not
+# cryptographically fresh, so they are sliced from one pool per session.
+_RANDPOOL = os.urandom(1 << 20)
+
+
+# Fixed 4 KiB of non-random content for tests that only need "some other
+# bytes" than a fixture file (which is drawn from _RANDPOOL).
+NONRANDOM_4K = bytes(range(256)) * 16
+
+
+def randbytes(n, offset=0):
+    """Return ``n`` pseudo-random bytes from the session pool at ``offset``."""
+    offset %= len(_RANDPOOL)
+    if offset + n <= len(_RANDPOOL):
+        return _RANDPOOL[offset:offset + n]
+    reps = (offset + n) // len(_RANDPOOL) + 1
+    return (_RANDPOOL * reps)[offset:offset + n]
+
+
+@functools.lru_cache(maxsize=16)
+def random_blob(size):
+    """Return ``(payload, sha256_hexdigest)`` for a pool payload of *size* bytes."""
+    data = randbytes(size)
+    return data, hashlib.sha256(data).hexdigest()
+
+
+_SMALL_HASH_MAX = 4096  # files shorter than this are hashed from one read()
+_MMAP_HASH_MIN = 10 * 1024 * 1024  # from here one mapped update() beats a read loop
+
+
+def _sha256_read(path):
+    fd = os.open(path, os.O_RDONLY)
+    with open(fd, "rb") as f:
+        # Most fixture files are a few bytes: one read, one update, done.
+        head = os.read(fd, _SMALL_HASH_MAX)
+        if len(head) < _SMALL_HASH_MAX:
+            return hashlib.sha256(head).hexdigest()
+        if hasattr(os, "posix_fadvise"):  # widen readahead for the full pass
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        f.seek(0)
+        if hasattr(hashlib, "file_digest") and \
+                os.fstat(fd).st_size < _MMAP_HASH_MIN:  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Hash the whole mapping in a single update() call
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return hashlib.sha256(m).hexdigest()
+
+
+_SHA256_CACHE = {}
+_IMMUTABLE_ROOTS = []  # session source trees that no test ever modifies
+
+
+def _register_immutable_tree(root):
+    """Let ``sha256_of_file`` memoize the files under *root*."""
+    _IMMUTABLE_ROOTS.append(os.path.join(os.path.abspath(root), ""))
+
+
 def sha256_of_file(path):
-    """Return hex SHA-256 digest of a local file."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    """
+    Return hex SHA-256 digest of a local file.
+
+    Only files inside the session-scoped source trees, which tests read
+    but never change, are memoized.  Copies, moves and tampered files are
+    hashed from their bytes on every call.
+    """
+    path = os.path.abspath(path)
+    if not path.startswith(tuple(_IMMUTABLE_ROOTS)):
+        return _sha256_read(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _SHA256_CACHE.get(key)
+    if digest is None:
+        digest = _SHA256_CACHE[key] = _sha256_read(path)
+    return digest
+
+
+_POOL_MIN_BYTES = 16 * 1024 * 1024  # below this, starting threads costs more than they save
+
+
+def _pool_workers(paths):
+    """
+    Thread count for per-file work over *paths*, or 0 to run serially.
+
+    A pool only pays off with several CPUs and enough data: on the
+    fixture trees (a few KB in all) it measured 3-4x slower than a plain
+    loop, so anything under ``_POOL_MIN_BYTES`` stays serial.
+    """
+    cpus = os.cpu_count() or 1
+    if cpus < 2 or len(paths) < 2:
+        return 0
+    if sum(os.stat(p).st_size for p in paths) < _POOL_MIN_BYTES:
+        return 0
+    return min(32, cpus * 4, len(paths))
+
+
+def sha256_of_files_many(paths):
+    """
+    Hash several local files.  Large batches are overlapped on a thread
+    pool (hashlib releases the GIL while it digests); small ones are
+    hashed in a loop.  Returns ``{path: hexdigest}``.
+    """
+    paths = list(paths)
+    workers = _pool_workers(paths)
+    if not workers:
+        return {p: sha256_of_file(p) for p in paths}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(sha256_of_file, paths)))
+
+
+def sha256_tree(root):
+    """Return ``{relative_path: hexdigest}`` for every file under *root*."""
+    root = Path(root)
+    digests = sha256_of_files_many(iter_files(root))
+    return {p.relative_to(root): h for p, h in digests.items()}
+
+
+class RemoteShell:
+    """
+    One long-lived ``ssh -T host /bin/sh`` per host.  Commands are written
+    to its stdin and their output is read back up to a per-shell sentinel
+    line, so N helper calls cost one local ``ssh`` process instead of N.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self._token = "__KOSMOKOPY_EOF_{}__".format(uuid.uuid4().hex).encode()
+        self._lock = threading.Lock()
+        self._proc = None
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            ["ssh"] + SSH_CTL + ["-T", self.host, "/bin/sh"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def run(self, command):
+        """Run *command* remotely; return ``(returncode, stdout_bytes)``."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            # The subshell keeps ``exit``/``cd`` in *command* from touching
+            # the long-lived shell.  The leading newline puts the sentinel on
+            # its own line even if the output does not end with one; it is
+            # stripped again below.
+            script = "( {}\n) </dev/null 2>/dev/null; printf '\\n%s %d\\n' {} \"$?\"\n".format(
+                command, self._token.decode())
+            try:
+                self._proc.stdin.write(script.encode())
+                self._proc.stdin.flush()
+            except BrokenPipeError:
+                self._proc = None
+                return 255, b""
+            out = []
+            for line in iter(self._proc.stdout.readline, b""):
+                if line.startswith(self._token + b" "):
+                    return int(line.split()[1]), b"".join(out)[:-1]
+                out.append(line)
+            # The shell died (e.g. the connection dropped) — restart next time
+            self._proc = None
+            return 255, b"".join(out)
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.stdin.close()
+                try:
+                    self._proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
+            self._proc = None
+
+
+_REMOTE_SHELLS = {}
+_REMOTE_SHELLS_LOCK = threading.Lock()
+
+
+def remote_run(host, command):
+    """
+    Run a shell command on *host* through its shared ``RemoteShell``.
+    Returns a ``subprocess.CompletedProcess`` with *bytes* stdout; callers
+    decode only the tokens they need.  stderr is discarded.
+    """
+    with _REMOTE_SHELLS_LOCK:
+        shell = _REMOTE_SHELLS.get(host)
+        if shell is None:
+            shell = _REMOTE_SHELLS[host] = RemoteShell(host)
+    returncode, stdout = shell.run(command)
+    return subprocess.CompletedProcess(command, returncode, stdout, None)
+
+
+def close_remote_shells():
+    with _REMOTE_SHELLS_LOCK:
+        shells = list(_REMOTE_SHELLS.values())
+        _REMOTE_SHELLS.clear()
+    for shell in shells:
+        shell.close()
+
+
+_REMOTE_HASHER = {}  # host -> "sha256sum" or "shasum -a 256"
+_REMOTE_ARGV_BATCH = 256  # paths per remote hasher invocation
+
+
+def _remote_hasher(host):
+    """Resolve (once per host) which SHA-256 command the remote has."""
+    if host not in _REMOTE_HASHER:
+        r = remote_run(host, "command -v sha256sum || command -v shasum")
+        if r.stdout.split(b"\n", 1)[0].strip().endswith(b"shasum"):
+            _REMOTE_HASHER[host] = "shasum -a 256"
+        else:
+            _REMOTE_HASHER[host] = "sha256sum"
+    return _REMOTE_HASHER[host]
 
 
 def sha256_remote(host, remote_path):
     """Return hex SHA-256 digest of a remote file via SSH."""
-    r = subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "sha256sum " + _sq(remote_path)],
-        capture_output=True, text=True,
-    )
-    if r.returncode == 0 and r.stdout.strip():
-        return r.stdout.strip().split()[0]
-    r = subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "shasum -a 256 " + _sq(remote_path)],
-        capture_output=True, text=True,
-    )
-    if r.returncode == 0 and r.stdout.strip():
-        return r.stdout.strip().split()[0]
+    return remote_mutate_and_hash(host, remote_path, None)
+
+
+def remote_mutate_and_hash(host, remote_path, mutation):
+    """
+    Run the shell command *mutation* on *host* (if given) and then hash
+    *remote_path*, in one round-trip.  Returns the hex digest; raises
+    ``RuntimeError`` if either step fails.
+    """
+    command = _remote_hasher(host) + " " + _sq(remote_path)
+    if mutation:
+        command = "{} && {}".format(mutation, command)
+    r = remote_run(host, command)
+    tokens = r.stdout.split(None, 1)
+    if r.returncode == 0 and tokens:
+        return tokens[0].lstrip(b"\\").decode()
     raise RuntimeError("Cannot hash remote file {} on {}".format(remote_path, host))
 
 
+def sha256_remote_many(host, remote_paths):
+    """
+    Hash several remote files in one SSH round-trip.
+
+    Returns a dict mapping each remote path (as given) to its hex SHA-256
+    digest.  Paths that could not be hashed are absent from the dict.
+    """
+    remote_paths = list(remote_paths)
+    if not remote_paths:
+        return {}
+    # Still one round-trip, but no single remote argv outgrows ARG_MAX
+    hasher = _remote_hasher(host)
+    r = remote_run(host, "\n".join(
+        hasher + " -- " + " ".join(_sq(p) for p in remote_paths[i:i + _REMOTE_ARGV_BATCH])
+        for i in range(0, len(remote_paths), _REMOTE_ARGV_BATCH)
+    ))
+    digests = {}
+    for line in r.stdout.splitlines():
+        digest, sep, path = line.partition(b"  ")
+        if sep:
+            digests[os.fsdecode(path)] = digest.lstrip(b"\\").decode()
+    return digests
+
+
+def sha256_tree_remote(host, remote_root):
+    """
+    Return ``{relative_posix_path: hexdigest}`` for every file under
+    *remote_root*, listing and hashing it in one round-trip (``find``
+    splits the hasher's argv itself).
+    """
+    r = remote_run(host, "cd {} && find . -type f -exec {} {{}} +".format(
+        _sq(remote_root), _remote_hasher(host)))
+    digests = {}
+    for line in r.stdout.splitlines():
+        digest, sep, path = line.partition(b"  ")
+        if sep:
+            digests[os.fsdecode(path)[2:]] = digest.lstrip(b"\\").decode()
+    return digests
+
+
+def assert_matches_remote(local_root, host, remote_root, local_hashes=None):
+    """
+    Assert every file under *local_root* has the same SHA-256 as the file
+    at the same relative path under *remote_root* on *host*.  All remote
+    digests are fetched in one round-trip.  *local_hashes* may supply the
+    ``sha256_tree`` of *local_root* when the caller already has it.
+    """
+    def remote_path(rel):
+        return "{}/{}".format(remote_root, rel.as_posix())
+
+    if local_hashes is not None:
+        remote = sha256_remote_many(host, map(remote_path, local_hashes))
+    else:
+        # The remote side only needs the names, so its round-trip runs
+        # while the local files are still being hashed
+        local_root = Path(local_root)
+        files = list(iter_files(local_root))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(
+                sha256_remote_many, host,
+                [remote_path(f.relative_to(local_root)) for f in files],
+            )
+            local_hashes = {
+                f.relative_to(local_root): h
+                for f, h in sha256_of_files_many(files).items()
+            }
+            remote = pending.result()
+    expected = {remote_path(rel): h for rel, h in local_hashes.items()}
+    for r, h in expected.items():
+        assert remote.get(r) == h, "Hash mismatch for {}".format(r)
+
+
 def remote_file_exists(host, remote_path):
-    r = subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "test -e " + _sq(remote_path)],
-        capture_output=True,
-    )
+    r = remote_run(host, "test -e " + _sq(remote_path))
     return r.returncode == 0
 
 
 def remote_ls(host, remote_dir):
     """List files under a remote directory (returns full paths)."""
-    r = subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "find " + _sq(remote_dir) + " -type f 2>/dev/null"],
-        capture_output=True, text=True,
-    )
+    r = remote_run(host, "find " + _sq(remote_dir) + " -type f 2>/dev/null")
     if r.returncode != 0:
         return []
-    return [l.strip() for l in r.stdout.strip().splitlines() if l.strip()]
+    return [os.fsdecode(l.strip()) for l in r.stdout.splitlines() if l.strip()]
 
 
 def remote_read(host, remote_path):
     """Read a remote file's contents."""
-    r = subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "cat " + _sq(remote_path)],
-        capture_output=True,
-    )
+    r = remote_run(host, "cat " + _sq(remote_path))
     assert r.returncode == 0, "Failed to read {} on {}".format(remote_path, host)
     return r.stdout
 
 
+def remote_write_file(host, remote_dir, name, text):
+    """Create *remote_dir* and write *text* plus a newline to *name* in it, in one round-trip."""
+    r = remote_run(host, "mkdir -p {0} && printf '%s\\n' {1} > {0}/{2}".format(
+        _sq(remote_dir), _sq(text), _sq(name)))
+    assert r.returncode == 0, "Failed to write {}/{} on {}".format(remote_dir, name, host)
+
+
 def remote_rm_rf(host, remote_path):
     """Recursively remove a remote directory."""
-    subprocess.run(
-        ["ssh"] + SSH_CTL + [host, "rm -rf " + _sq(remote_path)],
-        capture_output=True,
-    )
+    remote_run(host, "rm -rf " + _sq(remote_path))
+
+
+_SHELL_SAFE_RE = re.compile(r"\A[A-Za-z0-9_@%+=:,./-]+\Z")
 
 
 def _sq(s):
-    """Shell-quote with single quotes (mirrors Kosmokopy's shell_quote)."""
+    """Shell-quote with single quotes (mirrors Kosmokopy's shell_quote).
+
+    Strings made only of characters the shell never interprets are
+    returned as-is.
+    """
+    if _SHELL_SAFE_RE.match(s):
+        return s
     return "'" + s.replace("'", "'\\''") + "'"
 
 
+def iter_files(root):
+    """
+    Yield every regular file under *root* as a ``Path``.
+
+    Unlike ``rglob("*")`` + ``is_file()``, this uses the file type that
+    ``os.scandir`` already got from the directory listing, so no entry is
+    stat()ed a second time.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+
+
+def dst_file_names(root):
+    """Names (not paths) of every regular file under *root*."""
+    return frozenset(f.name for f in iter_files(root))
+
+
+def evict_page_cache(root):
+    """
+    Drop every file under *root* from the page cache, so the next read
+    comes from the device.  Dirty pages are not evicted, so each file is
+    flushed first.  A no-op where ``posix_fadvise`` is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for f in iter_files(root):
+        fd = os.open(f, os.O_RDONLY)
+        try:
+            os.fdatasync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+_COMPARE_CHUNK = 64 * 1024  # read size for chunked bytes compares
+
+
 def files_are_identical(a, b):
-    """Byte-by-byte comparison — mirrors the Rust function."""
-    a, b = Path(a), Path(b)
-    if a.stat().st_size != b.stat().st_size:
+    """Byte-by-byte comparison — mirrors the Rust function.
+
+    Sizes are compared first (two empty files are equal without being
+    opened); then both files are read in 64 KiB chunks and compared as
+    ``bytes``, stopping at the first differing chunk.  No hashing is
+    involved.
+    """
+    size = os.stat(a).st_size
+    if size != os.stat(b).st_size:
         return False
+    if size == 0:
+        return True
     with open(a, "rb") as fa, open(b, "rb") as fb:
         while True:
-            chunk_a = fa.read(8192)
-            chunk_b = fb.read(8192)
-            if chunk_a != chunk_b:
+            chunk = fa.read(_COMPARE_CHUNK)
+            if chunk != fb.read(_COMPARE_CHUNK):
                 return False
-            if not chunk_a:
+            if not chunk:
                 return True
 
 
+def flip_byte(path, offset, mask=0xFF):
+    """
+    XOR the byte at *offset* (negative counts from the end) with *mask* in
+    place, touching one block instead of rewriting the whole file.
+    """
+    fd = os.open(path, os.O_RDWR)
+    try:
+        if offset < 0:
+            offset += os.fstat(fd).st_size
+        b = os.pread(fd, 1, offset)
+        os.pwrite(fd, bytes([b[0] ^ mask]), offset)
+    finally:
+        os.close(fd)
+
+
+def assert_corrupted(original, path):
+    """
+    Assert that *path* no longer holds the bytes *original*.
+
+    Corruption tests capture the payload before tampering and compare the
+    file against it in 64 KiB ``bytes`` chunks; a size change passes at
+    once.
+    """
+    if os.stat(path).st_size != len(original):
+        return
+    original = bytes(original)
+    with open(path, "rb") as f:
+        for offset in range(0, len(original), _COMPARE_CHUNK):
+            if f.read(_COMPARE_CHUNK) != original[offset:offset + _COMPARE_CHUNK]:
+                return
+    raise AssertionError("{} was not modified".format(path))
+
+
+def files_identical_many(pairs):
+    """
+    ``files_are_identical`` over a list of ``(a, b)`` pairs.  Large batches
+    run on a thread pool so the reads overlap; small ones in a loop.
+    Returns a list of bools in order.
+    """
+    pairs = list(pairs)
+    workers = _pool_workers([a for a, _ in pairs])
+    if not workers:
+        return [files_are_identical(a, b) for a, b in pairs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda ab: files_are_identical(*ab), pairs))
+
+
+# ── Persistent SSH master ───────────────────────────────────────────────
+
+def _configured_hosts():
+    """Remote hosts that the current environment enables tests for."""
+    hosts = []
+    if REMOTE_HOST and REMOTE_PATH:
+        hosts.append(REMOTE_HOST)
+    if REMOTE_HOST2 and REMOTE_PATH2 and REMOTE_HOST2 not in hosts:
+        hosts.append(REMOTE_HOST2)
+    return hosts
+
+
+def _ssh_master_alive(host):
+    r = subprocess.run(
+        ["ssh", "-o", "ControlPath=" + SSH_CONTROL_PATH, "-O", "check", host],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return r.returncode == 0
+
+
+# Hosts whose ControlMaster could not be opened; their tests are skipped
+# instead of each one hanging on its own connection attempt.
+_UNREACHABLE_HOSTS = set()
+
+
+def _skip_unless_reachable(host):
+    if host in _UNREACHABLE_HOSTS:
+        pytest.skip("Could not open an SSH ControlMaster to {}".format(host))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ssh_masters():
+    """
+    Open one authenticated ControlMaster per configured host for the whole
+    session and close it again at the end.
+
+    The master listens on ``SSH_CONTROL_PATH``, so every ``ssh``/``scp``
+    call made with ``SSH_CTL`` is a channel multiplexed over the existing
+    connection rather than a fresh TCP + key-exchange handshake.  A master
+    that was already running (e.g. left over from a previous run) is
+    reused and left alone.  A host that cannot be reached without a prompt
+    is recorded in ``_UNREACHABLE_HOSTS`` so that only its tests skip.
+    """
+    opened = []
+    for host in _configured_hosts():
+        if _ssh_master_alive(host):
+            continue
+        # -f backgrounds ssh after authentication; its output must not be
+        # tied to pipes we wait on, or subprocess.run would block until the
+        # master exits.  The bounded ControlPersist reaps the master even if
+        # teardown never runs.
+        try:
+            r = subprocess.run(
+                ["ssh", "-M", "-N", "-f",
+                 "-o", "BatchMode=yes",
+                 "-o", "ConnectTimeout=10",
+                 "-o", "ControlMaster=yes",
+                 "-o", "ControlPath=" + SSH_CONTROL_PATH,
+                 "-o", "ControlPersist=600",
+                 host],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=30,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            _UNREACHABLE_HOSTS.add(host)
+            continue
+        if r.returncode == 0:
+            opened.append(host)
+        else:
+            _UNREACHABLE_HOSTS.add(host)
+    yield opened
+    close_remote_shells()
+    for host in opened:
+        subprocess.run(
+            ["ssh", "-o", "ControlPath=" + SSH_CONTROL_PATH, "-O", "exit", host],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+
+@pytest.fixture(autouse=True)
+def _skip_unreachable_remote(request, ssh_masters):
+    """Skip ``requires_remote``/``requires_remote2`` tests whose host is down."""
+    marks = list(request.node.iter_markers("skipif"))
+    if requires_remote.mark in marks:
+        _skip_unless_reachable(REMOTE_HOST)
+    if requires_remote2.mark in marks:
+        _skip_unless_reachable(REMOTE_HOST2)
+
+
+@pytest.fixture(scope="session")
+def ssh_pool(ssh_masters):
+    """
+    Thread pool for remote commands that do not depend on each other.
+
+    Each host has one ``RemoteShell`` whose lock runs its commands one at
+    a time, so the pool only overlaps work on different hosts (e.g. hashing
+    both ends of a relay), remote work with local work, and teardown
+    ``rm -rf`` calls that nothing waits on.  The pool is drained before the
+    masters are closed.
+    """
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
+def _remote_mkdir(host, remote_dir):
+    remote_run(host, "mkdir -p " + _sq(remote_dir)).check_returncode()
+
+
 # ── Fixtures ────────────────────────────────────────────────────────────
 
-@pytest.fixture
-def tmp_src(tmp_path):
-    """Create a temporary source directory with a handful of test files."""
-    src = tmp_path / "source"
+@pytest.fixture(scope="session")
+def _canonical_src(tmp_path_factory):
+    """The ``tmp_src`` tree, built once per session.  Never handed to tests."""
+    src = tmp_path_factory.mktemp("canon") / "source"
     src.mkdir()
 
     (src / "hello.txt").write_text("Hello, World!\n")
-    (src / "data.bin").write_bytes(os.urandom(4096))
+    (src / "data.bin").write_bytes(randbytes(4096, 0))
     (src / "notes.md").write_text("# Notes\nSome notes here.\n")
 
     sub = src / "subdir"
     sub.mkdir()
     (sub / "nested.txt").write_text("I am nested.\n")
-    (sub / "deep.dat").write_bytes(os.urandom(2048))
+    (sub / "deep.dat").write_bytes(randbytes(2048, 4096))
 
     deep = sub / "level2"
     deep.mkdir()
     (deep / "bottom.txt").write_text("Bottom level.\n")
 
+    _register_immutable_tree(src)
     return src
 
 
+_FICLONE = 0x40049409  # <linux/fs.h>: _IOW(0x94, 9, int)
+
+
+def _clone_file(src, dst):
+    """
+    ``copytree`` copy function.  On Linux it first tries a FICLONE reflink,
+    which shares every block copy-on-write in one ioctl (btrfs, XFS), then
+    copy_file_range(2), which at least stays in the kernel;
+    ``shutil.copyfile`` otherwise.  Tests may rewrite the clone freely.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fs, open(dst, "wb") as fd:
+                if fcntl is not None:
+                    try:
+                        fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+                        return dst
+                    except OSError:
+                        pass  # not reflink-capable; copy the data instead
+                remaining = os.fstat(fs.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fs.fileno(), fd.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                if remaining == 0:
+                    return dst
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return dst
+
+
 @pytest.fixture
-def tmp_src_with_spaces(tmp_path):
-    """Source tree with spaces in filenames and directory names."""
-    src = tmp_path / "source spaces"
+def tmp_src(tmp_path, _canonical_src):
+    """Create a temporary source directory with a handful of test files.
+
+    Each test gets its own copy of the canonical tree.  The files are real
+    copies, not hard links: move tests rename them into the destination
+    and some then rewrite them in place, which would write through a hard
+    link into the canonical tree.
+    """
+    src = tmp_path / "source"
+    shutil.copytree(_canonical_src, src, copy_function=_clone_file)
+    return src
+
+
+@pytest.fixture(scope="session")
+def session_src_hashes(_canonical_src):
+    """``sha256_tree`` of the ``tmp_src`` contents, computed once per session."""
+    return sha256_tree(_canonical_src)
+
+
+def _copy_canonical_once(tmp_path_factory, canonical, **options):
+    base = tmp_path_factory.mktemp("copied")
+    src = base / "source"
+    shutil.copytree(canonical, src, copy_function=_clone_file)
+    dst = base / "dest"
+    dst.mkdir()
+    return src, dst, run_kosmokopy(src=src, dst=dst, **options)
+
+
+@pytest.fixture(scope="class")
+def copied_tree(tmp_path_factory, _canonical_src):
+    """
+    ``(src, dst, result)`` of one standard ``tmp_src`` -> ``tmp_dst`` copy,
+    made once and shared by every test in the class.  Tests that take it
+    must treat both trees as read-only.
+    """
+    return _copy_canonical_once(tmp_path_factory, _canonical_src)
+
+
+@pytest.fixture(scope="class")
+def copied_tree_rsync(tmp_path_factory, _canonical_src):
+    """Like ``copied_tree``, but copied with ``method="rsync"``."""
+    return _copy_canonical_once(tmp_path_factory, _canonical_src, method="rsync")
+
+
+@pytest.fixture(scope="session")
+def tmp_src_with_spaces(tmp_path_factory):
+    """Source tree with spaces in filenames and directory names.
+
+    Session-scoped: tests only read from it, never move or modify it.
+    """
+    src = tmp_path_factory.mktemp("src") / "source spaces"
     src.mkdir()
     (src / "my file.txt").write_text("file with spaces\n")
     (src / "another doc.pdf").write_bytes(b"%PDF-fake content")
     sub = src / "sub folder"
     sub.mkdir()
     (sub / "inner file.txt").write_text("inner\n")
+    _register_immutable_tree(src)
     return src
 
 
-@pytest.fixture
-def tmp_src_with_exclusions(tmp_path):
-    """Source tree designed for testing exclusion patterns."""
-    src = tmp_path / "source"
+@pytest.fixture(scope="session")
+def tmp_src_with_exclusions(tmp_path_factory):
+    """Source tree designed for testing exclusion patterns.
+
+    Session-scoped: tests only read from it, never move or modify it.
+    """
+    src = tmp_path_factory.mktemp("src") / "source"
     src.mkdir()
 
     (src / "keep.txt").write_text("keep\n")
@@ -345,6 +965,7 @@ def tmp_src_with_exclusions(tmp_path):
     build.mkdir()
     (build / "artifact.o").write_bytes(b"obj")
 
+    _register_immutable_tree(src)
     return src
 
 
@@ -356,6 +977,17 @@ def tmp_dst(tmp_path):
     return dst
 
 
+@pytest.fixture
+def cold_cache():
+    """
+    Callable that evicts a tree from the page cache between the copy and
+    its verification, when ``KOSMOKOPY_COLD_CACHE=1``; a no-op otherwise.
+    """
+    if not COLD_CACHE:
+        return lambda root: None
+    return evict_page_cache
+
+
 @pytest.fixture
 def real_source():
     """Use user-supplied source directory if available."""
@@ -364,75 +996,221 @@ def real_source():
     pytest.skip("KOSMOKOPY_TEST_SOURCE_DIR not set or not a directory")
 
 
+def _new_remote_dir(kind):
+    return "{}/{}_{}_{}".format(REMOTE_PATH.rstrip("/"), kind, os.getpid(), uuid.uuid4().hex[:12])
+
+
 @pytest.fixture
-def remote_dest():
+def remote_dest(ssh_pool):
     """Provide a unique remote destination path; clean up after test."""
     if not (REMOTE_HOST and REMOTE_PATH):
         pytest.skip("Remote host not configured")
-    test_dir = "{}/test_{}_{}".format(REMOTE_PATH.rstrip("/"), os.getpid(), id(object()))
-    subprocess.run(
-        ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(test_dir)],
-        check=True, capture_output=True,
-    )
+    _skip_unless_reachable(REMOTE_HOST)
+    test_dir = _new_remote_dir("test")
+    _remote_mkdir(REMOTE_HOST, test_dir)
     yield REMOTE_HOST, test_dir
-    remote_rm_rf(REMOTE_HOST, test_dir)
+    ssh_pool.submit(remote_rm_rf, REMOTE_HOST, test_dir)
 
 
-@pytest.fixture
-def remote_src():
-    """Create a remote source directory with test files; clean up after."""
-    if not (REMOTE_HOST and REMOTE_PATH):
-        pytest.skip("Remote host not configured")
-    test_dir = "{}/src_{}_{}".format(REMOTE_PATH.rstrip("/"), os.getpid(), id(object()))
-    subprocess.run(
-        ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(test_dir)],
-        check=True, capture_output=True,
-    )
+def _populate_remote_src(ssh_pool, test_dir):
+    """Create *test_dir* on ``REMOTE_HOST`` holding the ``remote_src`` tree."""
+    # Build the local files while the remote mkdir is in flight
+    mkdir = ssh_pool.submit(_remote_mkdir, REMOTE_HOST, test_dir)
     with tempfile.TemporaryDirectory() as td:
         p = Path(td)
         (p / "remote_a.txt").write_text("Remote file A\n")
-        (p / "remote_b.bin").write_bytes(os.urandom(2048))
+        (p / "remote_b.bin").write_bytes(randbytes(2048, 6144))
         sub = p / "rsub"
         sub.mkdir()
         (sub / "remote_c.txt").write_text("Remote nested C\n")
-        subprocess.run(
-            ["scp"] + SSH_CTL + ["-q", "-r"]
-            + [str(p / "remote_a.txt"), str(p / "remote_b.bin"), str(p / "rsub")]
-            + ["{}:{}/".format(REMOTE_HOST, test_dir)],
-            check=True, capture_output=True,
+        mkdir.result()
+        # Stream the tree as one tar over a single channel instead of scp's
+        # per-file round-trips
+        tar = subprocess.Popen(
+            ["tar", "-C", str(p), "-cf", "-", "."],
+            stdout=subprocess.PIPE,
+        )
+        upload = subprocess.run(
+            ["ssh"] + SSH_CTL + [REMOTE_HOST, "tar -C " + _sq(test_dir) + " -xf -"],
+            stdin=tar.stdout, capture_output=True,
         )
+        tar.stdout.close()
+        assert tar.wait() == 0 and upload.returncode == 0, \
+            "Failed to upload remote_src to {}: {}".format(
+                REMOTE_HOST, upload.stderr.decode(errors="replace"))
+
+
+@pytest.fixture
+def remote_src(ssh_pool):
+    """Create a remote source directory with test files; clean up after."""
+    if not (REMOTE_HOST and REMOTE_PATH):
+        pytest.skip("Remote host not configured")
+    _skip_unless_reachable(REMOTE_HOST)
+    test_dir = _new_remote_dir("src")
+    _populate_remote_src(ssh_pool, test_dir)
     yield REMOTE_HOST, test_dir
-    remote_rm_rf(REMOTE_HOST, test_dir)
+    ssh_pool.submit(remote_rm_rf, REMOTE_HOST, test_dir)
+
+
+def _upload_canonical_once(tmp_path_factory, canonical, ssh_pool, **options):
+    if not (REMOTE_HOST and REMOTE_PATH):
+        pytest.skip("Remote host not configured")
+    _skip_unless_reachable(REMOTE_HOST)
+    src = tmp_path_factory.mktemp("uploaded") / "source"
+    shutil.copytree(canonical, src, copy_function=_clone_file)
+    rdir = _new_remote_dir("test")
+    _remote_mkdir(REMOTE_HOST, rdir)
+    yield src, REMOTE_HOST, rdir, run_kosmokopy(
+        src=src, dst="{}:{}".format(REMOTE_HOST, rdir), **options,
+    )
+    ssh_pool.submit(remote_rm_rf, REMOTE_HOST, rdir)
+
+
+@pytest.fixture(scope="class")
+def uploaded_tree(tmp_path_factory, _canonical_src, ssh_pool):
+    """
+    ``(src, host, rdir, result)`` of one standard ``tmp_src`` upload to
+    ``REMOTE_HOST``, made once and shared by every test in the class.
+    Tests that take it must treat both trees as read-only.
+    """
+    yield from _upload_canonical_once(tmp_path_factory, _canonical_src, ssh_pool)
+
+
+@pytest.fixture(scope="class")
+def uploaded_tree_rsync(tmp_path_factory, _canonical_src, ssh_pool):
+    """Like ``uploaded_tree``, but uploaded with ``method="rsync"``."""
+    yield from _upload_canonical_once(
+        tmp_path_factory, _canonical_src, ssh_pool, method="rsync",
+    )
+
+
+def _download_remote_src_once(tmp_path_factory, ssh_pool, **options):
+    if not (REMOTE_HOST and REMOTE_PATH):
+        pytest.skip("Remote host not configured")
+    _skip_unless_reachable(REMOTE_HOST)
+    rdir = _new_remote_dir("src")
+    _populate_remote_src(ssh_pool, rdir)
+    dst = tmp_path_factory.mktemp("downloaded") / "dst"
+    yield REMOTE_HOST, rdir, dst, run_kosmokopy(
+        src="{}:{}".format(REMOTE_HOST, rdir), dst=dst, **options,
+    )
+    ssh_pool.submit(remote_rm_rf, REMOTE_HOST, rdir)
+
+
+@pytest.fixture(scope="class")
+def downloaded_tree(tmp_path_factory, ssh_pool):
+    """
+    ``(host, rdir, dst, result)`` of one standard download of a
+    ``remote_src`` tree, made once and shared by every test in the class.
+    Tests that take it must treat both trees as read-only.
+    """
+    yield from _download_remote_src_once(tmp_path_factory, ssh_pool)
+
+
+@pytest.fixture(scope="class")
+def downloaded_tree_rsync(tmp_path_factory, ssh_pool):
+    """Like ``downloaded_tree``, but downloaded with ``method="rsync"``."""
+    yield from _download_remote_src_once(tmp_path_factory, ssh_pool, method="rsync")
 
 
 @pytest.fixture
-def remote_dest2():
+def remote_dest2(ssh_pool):
     """Remote destination on second host; clean up after."""
     if not (REMOTE_HOST2 and REMOTE_PATH2):
         pytest.skip("Second remote host not configured")
-    test_dir = "{}/test2_{}_{}".format(REMOTE_PATH2.rstrip("/"), os.getpid(), id(object()))
-    subprocess.run(
-        ["ssh"] + SSH_CTL + [REMOTE_HOST2, "mkdir -p " + _sq(test_dir)],
-        check=True, capture_output=True,
-    )
+    _skip_unless_reachable(REMOTE_HOST2)
+    test_dir = "{}/test2_{}_{}".format(REMOTE_PATH2.rstrip("/"), os.getpid(), uuid.uuid4().hex[:12])
+    _remote_mkdir(REMOTE_HOST2, test_dir)
     yield REMOTE_HOST2, test_dir
-    remote_rm_rf(REMOTE_HOST2, test_dir)
+    ssh_pool.submit(remote_rm_rf, REMOTE_HOST2, test_dir)
+
+
+# ── Optional tmpfs base directory ──────────────────────────────────────
+
+_TMPFS_ROOT = Path("/dev/shm")
+_TMPFS_MIN_FREE = 1 << 30  # 1 GiB
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--kosmokopy-tmpfs", action="store_true", default=False,
+        help="build test trees under /dev/shm (Linux tmpfs) instead of the "
+             "default temporary directory",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    With ``--kosmokopy-tmpfs``, point ``tmp_path_factory`` at a fresh
+    per-run directory under /dev/shm so copies run at memory speed.  An
+    explicit ``--basetemp`` (which xdist also hands its workers) wins.
+    """
+    if not config.getoption("kosmokopy_tmpfs") or config.option.basetemp:
+        return
+    if hasattr(os, "statvfs") and _TMPFS_ROOT.is_dir():
+        st = os.statvfs(_TMPFS_ROOT)
+        if st.f_bavail * st.f_frsize >= _TMPFS_MIN_FREE:
+            config._kosmokopy_tmpfs_dir = tempfile.mkdtemp(
+                prefix="kosmokopy-tests-", dir=str(_TMPFS_ROOT),
+            )
+            config.option.basetemp = config._kosmokopy_tmpfs_dir
+            return
+    config.issue_config_time_warning(
+        pytest.PytestConfigWarning(
+            "--kosmokopy-tmpfs: {} is unavailable or has less than 1 GiB free; "
+            "using the default temporary directory".format(_TMPFS_ROOT),
+        ),
+        stacklevel=2,
+    )
+
+
+def pytest_unconfigure(config):
+    """Remove the /dev/shm directory made by ``pytest_configure``, if any."""
+    tmpfs_dir = getattr(config, "_kosmokopy_tmpfs_dir", None)
+    if tmpfs_dir:
+        shutil.rmtree(tmpfs_dir, ignore_errors=True)
+
+
+# ── Scheduling under pytest-xdist ──────────────────────────────────────
+
+def _is_slow(item):
+    """Cancellation and rsync tests take the longest wall time."""
+    # The node id covers rsync classes such as TestLocalToRemoteRsync,
+    # whose test names do not mention rsync themselves
+    return item.path.name == "test_cancel.py" or "rsync" in item.nodeid.lower()
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    When the run is spread over xdist workers, queue the slow tests first
+    so they do not end up as the tail everyone waits on.  The sort is
+    stable and a plain serial run keeps its usual order.
+
+    Collection happens on the workers, whose ``numprocesses`` option xdist
+    resets, so the gate is the ``workerinput`` attribute only workers have.
+    Every worker sorts the same way, so their collections still agree.
+    """
+    if hasattr(config, "workerinput"):
+        items.sort(key=lambda item: not _is_slow(item))
 
 
 # ── Automatic report generation ─────────────────────────────────────────
 
-_collected_results = []  # populated by pytest_runtest_makereport
+_collected_results = []  # populated by pytest_runtest_logreport
+
 
+def pytest_runtest_logreport(report):
+    """Capture every test outcome (setup / call / teardown).
 
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """Capture every test outcome (setup / call / teardown)."""
-    outcome = yield
-    rep = outcome.get_result()
+    Unlike ``pytest_runtest_makereport``, this hook also fires in the
+    pytest-xdist controller for reports relayed from its workers, so the
+    summary below covers the whole run either way.
+    """
     # We only care about the "call" phase (the actual test body),
     # but also record setup/teardown failures.
-    if rep.when == "call" or (rep.when != "call" and rep.failed):
-        _collected_results.append(rep)
+    if report.when == "call" or (report.when != "call" and report.failed):
+        _collected_results.append(report)
 
 
 def pytest_terminal_summary(terminalreporter, exitstatus, config):
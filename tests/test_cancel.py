@@ -6,7 +6,6 @@ causes the transfer to stop gracefully with status "cancelled", and
 that files already copied remain intact.
 """
 
-import os
 from pathlib import Path
 
 import pytest
@@ -15,7 +14,9 @@ from conftest import (
     run_kosmokopy,
     run_kosmokopy_with_cancel,
     sha256_of_file,
-    files_are_identical,
+    files_identical_many,
+    iter_files,
+    randbytes,
     requires_remote,
     requires_rsync,
     sha256_remote,
@@ -33,17 +34,33 @@ from conftest import (
 # ═══════════════════════════════════════════════════════════════════════
 
 
-@pytest.fixture
-def large_src(tmp_path):
-    """Create a source tree with many small files so cancel can fire mid-run."""
-    src = tmp_path / "source"
+LARGE_SRC_TOP = 200
+LARGE_SRC_NESTED = 50
+LARGE_SRC_FILES = LARGE_SRC_TOP + LARGE_SRC_NESTED
+MOVE_SRC_FILES = 200
+
+# Relative paths of every file large_src writes, so tests can check a
+# destination entry against the manifest instead of stat()ing the source.
+LARGE_SRC_RELPATHS = frozenset(
+    [Path(f"file_{i:04d}.txt") for i in range(LARGE_SRC_TOP)]
+    + [Path("subdir") / f"nested_{i:03d}.dat" for i in range(LARGE_SRC_NESTED)]
+)
+
+
+@pytest.fixture(scope="session")
+def large_src(tmp_path_factory):
+    """Create a source tree with many small files so cancel can fire mid-run.
+
+    Session-scoped: only copied from, never moved (see large_src_for_move).
+    """
+    src = tmp_path_factory.mktemp("src") / "source"
     src.mkdir()
-    for i in range(200):
+    for i in range(LARGE_SRC_TOP):
         (src / f"file_{i:04d}.txt").write_text(f"content of file {i}\n")
     sub = src / "subdir"
     sub.mkdir()
-    for i in range(50):
-        (sub / f"nested_{i:03d}.dat").write_bytes(os.urandom(512))
+    for i in range(LARGE_SRC_NESTED):
+        (sub / f"nested_{i:03d}.dat").write_bytes(randbytes(512, i * 512))
     return src
 
 
@@ -52,7 +69,7 @@ def large_src_for_move(tmp_path):
     """Separate large source tree for move-cancel tests (avoids mutation)."""
     src = tmp_path / "move_source"
     src.mkdir()
-    for i in range(200):
+    for i in range(MOVE_SRC_FILES):
         (src / f"file_{i:04d}.txt").write_text(f"content of file {i}\n")
     return src
 
@@ -80,8 +97,7 @@ class TestLocalCancelStandard:
         )
         if result["status"] == "cancelled":
             # Fewer than total
-            total_src = sum(1 for _ in large_src.rglob("*") if _.is_file())
-            assert result["copied"] < total_src
+            assert result["copied"] < LARGE_SRC_FILES
             assert result["copied"] >= 0
 
     def test_cancel_copied_files_intact(self, large_src, tmp_path):
@@ -93,13 +109,13 @@ class TestLocalCancelStandard:
         # Verify every file in dst matches corresponding source
         root = dst / large_src.name
         if root.exists():
-            for dst_file in root.rglob("*"):
-                if dst_file.is_file():
-                    rel = dst_file.relative_to(root)
-                    src_file = large_src / rel
-                    assert src_file.exists(), f"Source missing for {rel}"
-                    assert files_are_identical(src_file, dst_file), \
-                        f"Mismatch for {rel}"
+            pairs = []
+            for dst_file in iter_files(root):
+                rel = dst_file.relative_to(root)
+                assert rel in LARGE_SRC_RELPATHS, f"Source missing for {rel}"
+                pairs.append((large_src / rel, dst_file))
+            for (src_file, dst_file), ok in zip(pairs, files_identical_many(pairs)):
+                assert ok, f"Mismatch for {dst_file.relative_to(root)}"
 
     def test_cancel_no_errors(self, large_src, tmp_path):
         """Graceful cancel should not produce errors."""
@@ -112,16 +128,14 @@ class TestLocalCancelStandard:
     def test_cancel_move_preserves_uncopied_source(self, large_src_for_move, tmp_path):
         """Cancel during move: un-transferred source files must still exist."""
         dst = tmp_path / "dest"
-        total_src = sum(1 for _ in large_src_for_move.rglob("*") if _.is_file())
-
         result = run_kosmokopy_with_cancel(
             src=large_src_for_move, dst=dst, move=True, cancel_after=0.2,
         )
         if result["status"] == "cancelled":
-            remaining = sum(1 for _ in large_src_for_move.rglob("*") if _.is_file())
+            remaining = sum(1 for _ in iter_files(large_src_for_move))
             copied = result["copied"]
             # remaining + copied should account for all original files
-            assert remaining + copied == total_src
+            assert remaining + copied == MOVE_SRC_FILES
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -147,11 +161,8 @@ class TestLocalCancelRsync:
         )
         root = dst / large_src.name
         if root.exists():
-            for dst_file in root.rglob("*"):
-                if dst_file.is_file():
-                    rel = dst_file.relative_to(root)
-                    src_file = large_src / rel
-                    assert files_are_identical(src_file, dst_file)
+            pairs = [(large_src / f.relative_to(root), f) for f in iter_files(root)]
+            assert all(files_identical_many(pairs))
 
 
 # ═══════════════════════════════════════════════════════════════════════
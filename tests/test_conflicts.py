@@ -6,19 +6,21 @@ Verification is done in Python.
 """
 
 import os
-from pathlib import Path
 
 import pytest
 
 import shutil
 
 from conftest import (
+    NONRANDOM_4K,
+    assert_matches_remote,
+    files_are_identical,
     run_kosmokopy,
     requires_remote,
     sha256_of_file,
     sha256_remote,
+    sha256_remote_many,
     remote_file_exists,
-    remote_ls,
     remote_read,
     SSH_CTL,
     _sq,
@@ -26,31 +28,80 @@ from conftest import (
 
 
 # ═══════════════════════════════════════════════════════════════════════
-#  Local conflict: Skip
+#  Local conflict: one pre-existing file, every mode
 # ═══════════════════════════════════════════════════════════════════════
 
 
-class TestConflictSkipLocal:
+def _run_conflict_case(tmp_src, tmp_dst, *, conflict, name, stale, kept, copied_to):
+    """
+    Pre-populate ``root/name`` with *stale* bytes, run kosmokopy with
+    *conflict*, then check that the stale bytes are still at *kept* (if not
+    None) and that *copied_to* (if not None) is identical to the source.
+    """
+    root = tmp_dst / tmp_src.name
+    root.mkdir(parents=True, exist_ok=True)
+    (root / name).write_bytes(stale)
+    assert not files_are_identical(tmp_src / name, root / name)
+
+    result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict=conflict)
+    assert result["status"] == "finished"
+    assert result["errors"] == []
+
+    if kept is not None:
+        assert (root / kept).read_bytes() == stale
+    if copied_to is not None:
+        assert (root / copied_to).exists()
+        assert files_are_identical(root / copied_to, tmp_src / name)
+    return result
+
+
+class TestConflictLocal:
+
+    @pytest.mark.parametrize(
+        "conflict,name,stale,kept,copied_to",
+        [
+            ("skip", "hello.txt", b"DIFFERENT CONTENT\n", "hello.txt", None),
+            ("overwrite", "hello.txt", b"OLD CONTENT\n", None, "hello.txt"),
+            ("overwrite", "data.bin", NONRANDOM_4K, None, "data.bin"),
+            ("rename", "hello.txt", b"EXISTING\n", "hello.txt", "hello_1.txt"),
+            ("rename", "data.bin", b"different", "data.bin", "data_1.bin"),
+        ],
+        ids=[
+            "skip_preserves_existing",
+            "overwrite_replaces_content",
+            "overwrite_binary",
+            "rename_creates_numbered_copy",
+            "rename_preserves_extension",
+        ],
+    )
+    def test_single_conflict(self, tmp_src, tmp_dst, conflict, name, stale, kept, copied_to):
+        result = _run_conflict_case(
+            tmp_src, tmp_dst,
+            conflict=conflict, name=name, stale=stale, kept=kept, copied_to=copied_to,
+        )
+        if conflict == "skip":
+            # The conflicting file was skipped; the others were copied
+            assert len(result["skipped"]) >= 1
 
-    def test_skip_preserves_existing(self, tmp_src, tmp_dst):
-        """Existing different file at dest is not overwritten."""
-        root = tmp_dst / tmp_src.name
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "hello.txt").write_text("DIFFERENT CONTENT\n")
-        original_hash = sha256_of_file(root / "hello.txt")
 
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="skip")
-        assert result["status"] == "finished"
-        # hello.txt was skipped; others copied
-        assert len(result["skipped"]) >= 1
-        assert sha256_of_file(root / "hello.txt") == original_hash
+# ═══════════════════════════════════════════════════════════════════════
+#  Local conflict: Skip
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestConflictSkipLocal:
 
     def test_skip_identical_deletes_source_on_move(self, tmp_src, tmp_dst):
         """Move mode + identical file: source deleted, dest untouched."""
         root = tmp_dst / tmp_src.name
         root.mkdir(parents=True, exist_ok=True)
         src_file = tmp_src / "hello.txt"
-        shutil.copy2(str(src_file), str(root / "hello.txt"))
+        # Same tmp filesystem, so a hard link gives identical content
+        # without copying the bytes
+        try:
+            os.link(src_file, root / "hello.txt")
+        except OSError:
+            shutil.copyfile(src_file, root / "hello.txt")
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="skip", move=True)
         assert result["status"] == "finished"
@@ -58,36 +109,6 @@ class TestConflictSkipLocal:
         assert not src_file.exists()
 
 
-# ═══════════════════════════════════════════════════════════════════════
-#  Local conflict: Overwrite
-# ═══════════════════════════════════════════════════════════════════════
-
-
-class TestConflictOverwriteLocal:
-
-    def test_overwrite_replaces_content(self, tmp_src, tmp_dst):
-        root = tmp_dst / tmp_src.name
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "hello.txt").write_text("OLD CONTENT\n")
-
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="overwrite")
-        assert result["status"] == "finished"
-        assert result["errors"] == []
-
-        # Content now matches source
-        assert (root / "hello.txt").read_text() == (tmp_src / "hello.txt").read_text()
-
-    def test_overwrite_binary(self, tmp_src, tmp_dst):
-        root = tmp_dst / tmp_src.name
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "data.bin").write_bytes(os.urandom(4096))
-
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="overwrite")
-        assert result["status"] == "finished"
-
-        assert sha256_of_file(tmp_src / "data.bin") == sha256_of_file(root / "data.bin")
-
-
 # ═══════════════════════════════════════════════════════════════════════
 #  Local conflict: Rename
 # ═══════════════════════════════════════════════════════════════════════
@@ -95,21 +116,6 @@ class TestConflictOverwriteLocal:
 
 class TestConflictRenameLocal:
 
-    def test_rename_creates_numbered_copy(self, tmp_src, tmp_dst):
-        root = tmp_dst / tmp_src.name
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "hello.txt").write_text("EXISTING\n")
-
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="rename")
-        assert result["status"] == "finished"
-        assert result["errors"] == []
-
-        # Original untouched
-        assert (root / "hello.txt").read_text() == "EXISTING\n"
-        # Renamed copy created
-        assert (root / "hello_1.txt").exists()
-        assert (root / "hello_1.txt").read_text() == (tmp_src / "hello.txt").read_text()
-
     def test_rename_increments(self, tmp_src, tmp_dst):
         """Multiple pre-existing files increment the counter."""
         root = tmp_dst / tmp_src.name
@@ -122,18 +128,7 @@ class TestConflictRenameLocal:
         assert result["status"] == "finished"
 
         assert (root / "hello_3.txt").exists()
-        assert (root / "hello_3.txt").read_text() == (tmp_src / "hello.txt").read_text()
-
-    def test_rename_preserves_extension(self, tmp_src, tmp_dst):
-        root = tmp_dst / tmp_src.name
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "data.bin").write_bytes(b"different")
-
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="rename")
-        assert result["status"] == "finished"
-
-        assert (root / "data_1.bin").exists()
-        assert sha256_of_file(tmp_src / "data.bin") == sha256_of_file(root / "data_1.bin")
+        assert files_are_identical(root / "hello_3.txt", tmp_src / "hello.txt")
 
     def test_rename_no_extension(self, tmp_path):
         """Rename works for files with no extension."""
@@ -150,9 +145,9 @@ class TestConflictRenameLocal:
         result = run_kosmokopy(src=src, dst=dst, conflict="rename")
         assert result["status"] == "finished"
 
-        assert (root / "Makefile").read_text() == "old\n"
+        assert (root / "Makefile").read_bytes() == b"old\n"
         assert (root / "Makefile_1").exists()
-        assert (root / "Makefile_1").read_text() == "new\n"
+        assert (root / "Makefile_1").read_bytes() == b"new\n"
 
     def test_rename_move_mode(self, tmp_src, tmp_dst):
         """Rename + move: source deleted, renamed copy at dest."""
@@ -160,14 +155,14 @@ class TestConflictRenameLocal:
         root.mkdir(parents=True, exist_ok=True)
         (root / "hello.txt").write_text("EXISTING\n")
         src_hello = tmp_src / "hello.txt"
-        original_content = src_hello.read_text()
+        original_content = src_hello.read_bytes()
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="rename", move=True)
         assert result["status"] == "finished"
 
         assert not src_hello.exists()
-        assert (root / "hello.txt").read_text() == "EXISTING\n"
-        assert (root / "hello_1.txt").read_text() == original_content
+        assert (root / "hello.txt").read_bytes() == b"EXISTING\n"
+        assert (root / "hello_1.txt").read_bytes() == original_content
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -187,10 +182,10 @@ class TestConflictRenameLocalRsync:
         assert result["errors"] == []
 
         # Original untouched
-        assert (root / "hello.txt").read_text() == "EXISTING\n"
+        assert (root / "hello.txt").read_bytes() == b"EXISTING\n"
         # Renamed copy created
         assert (root / "hello_1.txt").exists()
-        assert (root / "hello_1.txt").read_text() == (tmp_src / "hello.txt").read_text()
+        assert files_are_identical(root / "hello_1.txt", tmp_src / "hello.txt")
 
     def test_rename_rsync_move_mode(self, tmp_src, tmp_dst):
         """Rename + move via rsync: source deleted, renamed copy at dest."""
@@ -198,14 +193,14 @@ class TestConflictRenameLocalRsync:
         root.mkdir(parents=True, exist_ok=True)
         (root / "hello.txt").write_text("EXISTING\n")
         src_hello = tmp_src / "hello.txt"
-        original_content = src_hello.read_text()
+        original_content = src_hello.read_bytes()
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, conflict="rename", move=True, method="rsync")
         assert result["status"] == "finished"
 
         assert not src_hello.exists()
-        assert (root / "hello.txt").read_text() == "EXISTING\n"
-        assert (root / "hello_1.txt").read_text() == original_content
+        assert (root / "hello.txt").read_bytes() == b"EXISTING\n"
+        assert (root / "hello_1.txt").read_bytes() == original_content
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -216,7 +211,7 @@ class TestConflictRenameLocalRsync:
 @requires_remote
 class TestConflictSkipRemote:
 
-    def test_skip_existing_remote_file(self, tmp_src, remote_dest):
+    def test_skip_existing_remote_file(self, tmp_src, remote_dest, session_src_hashes):
         host, rdir = remote_dest
 
         # First upload
@@ -230,6 +225,11 @@ class TestConflictSkipRemote:
         assert len(result["skipped"]) == 6
         assert result["copied"] == 0
 
+        # Remote copies are untouched — verify every hash in one round-trip
+        assert_matches_remote(
+            tmp_src, host, "{}/{}".format(rdir, tmp_src.name), session_src_hashes,
+        )
+
 
 @requires_remote
 class TestConflictOverwriteRemote:
@@ -271,11 +271,11 @@ class TestConflictRenameRemote:
         assert result["copied"] == 6
         assert result["errors"] == []
 
-        # Both original and renamed files should exist
-        files = remote_ls(host, rdir)
-        names = {Path(f).name for f in files}
-        assert "hello.txt" in names
-        assert "hello_1.txt" in names
+        # Both original and renamed files should exist with the source content
+        root = "{}/{}".format(rdir, tmp_src.name)
+        hashes = sha256_remote_many(host, [root + "/hello.txt", root + "/hello_1.txt"])
+        expected = sha256_of_file(tmp_src / "hello.txt")
+        assert hashes == {root + "/hello.txt": expected, root + "/hello_1.txt": expected}
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -286,7 +286,7 @@ class TestConflictRenameRemote:
 @requires_remote
 class TestConflictSkipRemoteRsync:
 
-    def test_skip_existing_remote_rsync(self, tmp_src, remote_dest):
+    def test_skip_existing_remote_rsync(self, tmp_src, remote_dest, session_src_hashes):
         host, rdir = remote_dest
 
         # First upload via rsync
@@ -302,6 +302,11 @@ class TestConflictSkipRemoteRsync:
         assert len(result["skipped"]) == 6
         assert result["copied"] == 0
 
+        # Remote copies are untouched — verify every hash in one round-trip
+        assert_matches_remote(
+            tmp_src, host, "{}/{}".format(rdir, tmp_src.name), session_src_hashes,
+        )
+
 
 @requires_remote
 class TestConflictOverwriteRemoteRsync:
@@ -343,8 +348,8 @@ class TestConflictRenameRemoteRsync:
         assert result["copied"] == 6
         assert result["errors"] == []
 
-        # Both original and renamed files should exist
-        files = remote_ls(host, rdir)
-        names = {Path(f).name for f in files}
-        assert "hello.txt" in names
-        assert "hello_1.txt" in names
+        # Both original and renamed files should exist with the source content
+        root = "{}/{}".format(rdir, tmp_src.name)
+        hashes = sha256_remote_many(host, [root + "/hello.txt", root + "/hello_1.txt"])
+        expected = sha256_of_file(tmp_src / "hello.txt")
+        assert hashes == {root + "/hello.txt": expected, root + "/hello_1.txt": expected}
@@ -5,12 +5,7 @@ Operations are performed by invoking ``kosmokopy --cli`` with --exclude.
 Verification is done in Python.
 """
 
-import os
-from pathlib import Path
-
-import pytest
-
-from conftest import run_kosmokopy, sha256_of_file
+from conftest import dst_file_names, run_kosmokopy
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -27,7 +22,7 @@ class TestDirectoryExclusion:
         assert result["status"] == "finished"
         assert result["excluded_dirs"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" not in dst_names
         assert "keep.txt" in dst_names
         assert "doc.txt" in dst_names
@@ -40,7 +35,7 @@ class TestDirectoryExclusion:
         assert result["status"] == "finished"
         assert result["excluded_dirs"] == 2
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" not in dst_names
         assert "doc.txt" not in dst_names
         assert "keep.txt" in dst_names
@@ -55,7 +50,7 @@ class TestDirectoryExclusion:
         assert result["excluded_files"] == 0
         assert result["excluded_dirs"] == 0
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "keep.txt" in dst_names
         assert "cached.dat" in dst_names
 
@@ -74,7 +69,7 @@ class TestFileExclusion:
         assert result["status"] == "finished"
         assert result["excluded_files"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "skip_me.log" not in dst_names
         assert "keep.txt" in dst_names
 
@@ -86,7 +81,7 @@ class TestFileExclusion:
         assert result["status"] == "finished"
         assert result["excluded_files"] == 2
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "skip_me.log" not in dst_names
         assert "data.tmp" not in dst_names
 
@@ -105,7 +100,7 @@ class TestWildcardDirExclusion:
         assert result["status"] == "finished"
         assert result["excluded_dirs"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "artifact.o" not in dst_names
         assert "keep.txt" in dst_names
 
@@ -117,7 +112,7 @@ class TestWildcardDirExclusion:
         assert result["status"] == "finished"
         assert result["excluded_dirs"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" not in dst_names
 
     def test_wildcard_dir_no_match(self, tmp_src_with_exclusions, tmp_dst):
@@ -127,7 +122,7 @@ class TestWildcardDirExclusion:
         assert result["status"] == "finished"
         assert result["excluded_dirs"] == 0
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" in dst_names
 
 
@@ -145,7 +140,7 @@ class TestWildcardFileExclusion:
         assert result["status"] == "finished"
         assert result["excluded_files"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "skip_me.log" not in dst_names
 
     def test_wildcard_file_case_insensitive(self, tmp_src_with_exclusions, tmp_dst):
@@ -156,7 +151,7 @@ class TestWildcardFileExclusion:
         assert result["status"] == "finished"
         assert result["excluded_files"] == 2
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "PHOTO.JPG" not in dst_names
         assert "snapshot.jpg" not in dst_names
 
@@ -167,7 +162,7 @@ class TestWildcardFileExclusion:
         assert result["status"] == "finished"
         assert result["excluded_files"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "data.tmp" not in dst_names
         assert "keep.txt" in dst_names
 
@@ -188,7 +183,7 @@ class TestCombinedExclusions:
         assert result["excluded_dirs"] == 1
         assert result["excluded_files"] == 1
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" not in dst_names
         assert "skip_me.log" not in dst_names
         assert "keep.txt" in dst_names
@@ -202,7 +197,7 @@ class TestCombinedExclusions:
         assert result["excluded_dirs"] == 2   # /cache + ~/build*
         assert result["excluded_files"] == 2  # skip_me.log + ~*.tmp
 
-        dst_names = {f.name for f in tmp_dst.rglob("*") if f.is_file()}
+        dst_names = dst_file_names(tmp_dst)
         assert "cached.dat" not in dst_names    # /cache dir excluded
         assert "skip_me.log" not in dst_names   # exact file excluded
         assert "artifact.o" not in dst_names    # build* dir excluded
@@ -11,22 +11,34 @@ copied file and confirm that our verification helpers detect the change.
 
 import hashlib
 import os
-import subprocess
 from pathlib import Path
 
 import pytest
 
+import conftest
 from conftest import (
     run_kosmokopy,
     requires_remote,
     requires_rsync,
     sha256_of_file,
+    sha256_tree,
     sha256_remote,
+    sha256_remote_many,
+    remote_mutate_and_hash,
+    assert_matches_remote,
     remote_file_exists,
+    remote_ls,
     remote_rm_rf,
+    remote_run,
     files_are_identical,
-    SSH_CTL,
+    files_identical_many,
+    iter_files,
+    assert_corrupted,
+    flip_byte,
+    randbytes,
+    random_blob,
     _sq,
+    _register_immutable_tree,
 )
 
 
@@ -37,29 +49,29 @@ from conftest import (
 
 class TestLocalCopyIntegrity:
 
-    def test_all_files_identical_after_copy(self, tmp_src, tmp_dst):
+    def test_all_files_identical_after_copy(
+        self, copied_tree, session_src_hashes, cold_cache,
+    ):
         """Every copied file must be byte-identical to the source."""
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst)
+        tmp_src, tmp_dst, result = copied_tree
         assert result["status"] == "finished"
         assert result["errors"] == []
 
         root = tmp_dst / tmp_src.name
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert files_are_identical(f, root / rel)
+        cold_cache(root)
+        assert sha256_tree(root) == session_src_hashes
 
-    def test_binary_file_integrity(self, tmp_path):
+    def test_binary_file_integrity(self, tmp_path, cold_cache):
         """Large binary file copied through the app stays intact."""
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(100_000)
+        data, expected = random_blob(100_000)
         (src / "big.bin").write_bytes(data)
-        expected = hashlib.sha256(data).hexdigest()
 
         dst = tmp_path / "dst"
         result = run_kosmokopy(src=src, dst=dst)
         assert result["status"] == "finished"
+        cold_cache(dst)
 
         assert sha256_of_file(dst / "src" / "big.bin") == expected
 
@@ -85,23 +97,22 @@ class TestLocalCopyIntegrity:
 @requires_rsync
 class TestLocalRsyncIntegrity:
 
-    def test_rsync_files_identical(self, tmp_src, tmp_dst):
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync")
+    def test_rsync_files_identical(self, copied_tree_rsync):
+        tmp_src, tmp_dst, result = copied_tree_rsync
         assert result["status"] == "finished"
         assert result["errors"] == []
 
         root = tmp_dst / tmp_src.name
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert files_are_identical(f, root / rel)
+        srcs = list(iter_files(tmp_src))
+        pairs = [(f, root / f.relative_to(tmp_src)) for f in srcs]
+        for f, same in zip(srcs, files_identical_many(pairs)):
+            assert same, "Mismatch for {}".format(f)
 
     def test_rsync_large_binary(self, tmp_path):
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(100_000)
+        data, expected = random_blob(100_000)
         (src / "big.bin").write_bytes(data)
-        expected = hashlib.sha256(data).hexdigest()
 
         dst = tmp_path / "dst"
         result = run_kosmokopy(src=src, dst=dst, method="rsync")
@@ -121,9 +132,8 @@ class TestMoveIntegrity:
         """After a successful move, source files are gone and dest is intact."""
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(8192)
+        data, expected = random_blob(8192)
         (src / "move_me.bin").write_bytes(data)
-        expected = hashlib.sha256(data).hexdigest()
 
         dst = tmp_path / "dst"
         result = run_kosmokopy(src=src, dst=dst, move=True)
@@ -133,27 +143,22 @@ class TestMoveIntegrity:
         assert not (src / "move_me.bin").exists()
         assert sha256_of_file(dst / "src" / "move_me.bin") == expected
 
-    def test_move_multiple_files(self, tmp_src, tmp_dst):
-        originals = {}
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                originals[f.relative_to(tmp_src)] = sha256_of_file(f)
+    def test_move_multiple_files(self, tmp_src, tmp_dst, session_src_hashes):
+        originals = session_src_hashes
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, move=True)
         assert result["status"] == "finished"
 
         root = tmp_dst / tmp_src.name
-        for rel, h in originals.items():
-            assert not (tmp_src / rel).exists(), "Source not removed: {}".format(rel)
-            assert sha256_of_file(root / rel) == h
+        assert list(iter_files(tmp_src)) == [], "Source not removed"
+        assert sha256_tree(root) == originals
 
     @requires_rsync
     def test_rsync_move(self, tmp_path):
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(8192)
+        data, expected = random_blob(8192)
         (src / "rsync_move.bin").write_bytes(data)
-        expected = hashlib.sha256(data).hexdigest()
 
         dst = tmp_path / "dst"
         result = run_kosmokopy(src=src, dst=dst, move=True, method="rsync")
@@ -171,26 +176,23 @@ class TestMoveIntegrity:
 @requires_remote
 class TestRemoteUploadIntegrity:
 
-    def test_upload_hash_match(self, tmp_src, remote_dest):
+    def test_upload_hash_match(self, tmp_src, remote_dest, session_src_hashes):
         """After upload, remote SHA-256 matches local."""
         host, rdir = remote_dest
         result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
         assert result["status"] == "finished"
         assert result["errors"] == []
 
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                remote_path = "{}/{}/{}".format(rdir, tmp_src.name, rel)
-                assert sha256_of_file(f) == sha256_remote(host, remote_path)
+        assert_matches_remote(
+            tmp_src, host, "{}/{}".format(rdir, tmp_src.name), session_src_hashes,
+        )
 
     def test_upload_large_binary(self, tmp_path, remote_dest):
         host, rdir = remote_dest
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(50_000)
+        data, expected = random_blob(50_000)
         (src / "big.bin").write_bytes(data)
-        expected = hashlib.sha256(data).hexdigest()
 
         result = run_kosmokopy(src=src, dst="{}:{}".format(host, rdir))
         assert result["status"] == "finished"
@@ -210,7 +212,7 @@ class TestRemoteMoveIntegrity:
         src = tmp_path / "src"
         src.mkdir()
         f = src / "to_move.bin"
-        f.write_bytes(os.urandom(4096))
+        f.write_bytes(randbytes(4096))
         expected = sha256_of_file(f)
 
         result = run_kosmokopy(
@@ -242,11 +244,7 @@ class TestRemoteDownloadIntegrity:
 
         root_name = Path(rdir).name
         root = dst / root_name
-        for f in root.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(root)
-                remote_path = "{}/{}".format(rdir, rel)
-                assert sha256_of_file(f) == sha256_remote(host, remote_path)
+        assert_matches_remote(root, host, rdir)
 
     def test_download_move_deletes_remote(self, tmp_path, remote_src):
         host, rdir = remote_src
@@ -259,11 +257,7 @@ class TestRemoteDownloadIntegrity:
         assert result["copied"] >= 1
 
         # Remote files should be gone
-        remaining = subprocess.run(
-            ["ssh"] + SSH_CTL + [host, "find {} -type f".format(_sq(rdir))],
-            capture_output=True, text=True,
-        )
-        assert remaining.stdout.strip() == ""
+        assert remote_ls(host, rdir) == []
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -274,15 +268,16 @@ class TestRemoteDownloadIntegrity:
 class TestCorruptionDetectionLocal:
     """
     Copy files with kosmokopy, then deliberately corrupt the destination
-    and verify that our integrity helpers (files_are_identical, sha256_of_file)
-    catch the corruption.
+    and verify that the tampering is caught: the copy matches
+    ``sha256_of_file``/``files_are_identical`` before, and after it both
+    ``assert_corrupted`` and the hash helpers see the change.
     """
 
     def test_single_byte_flip(self, tmp_path):
         """Flipping one byte in the copied file is detected."""
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(8192)
+        data = randbytes(8192)
         (src / "file.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "file.bin")
 
@@ -296,12 +291,10 @@ class TestCorruptionDetectionLocal:
         assert files_are_identical(src / "file.bin", copied)
 
         # Corrupt: flip one byte
-        corrupted = bytearray(copied.read_bytes())
-        corrupted[len(corrupted) // 2] ^= 0xFF
-        copied.write_bytes(bytes(corrupted))
+        flip_byte(copied, len(data) // 2)
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "file.bin", copied)
 
     def test_appended_byte(self, tmp_path):
         """Appending a single byte is detected."""
@@ -322,14 +315,14 @@ class TestCorruptionDetectionLocal:
         with open(copied, "ab") as f:
             f.write(b"\x00")
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "msg.txt", copied)
 
     def test_truncated_file(self, tmp_path):
         """Truncating a copied file is detected."""
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(10_000)
+        data = randbytes(10_000)
         (src / "big.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "big.bin")
 
@@ -343,14 +336,15 @@ class TestCorruptionDetectionLocal:
         # Corrupt: truncate to half
         copied.write_bytes(data[:5000])
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "big.bin", copied)
 
     def test_replaced_with_different_content(self, tmp_path):
         """Replacing file contents entirely is detected."""
         src = tmp_path / "src"
         src.mkdir()
-        (src / "doc.txt").write_text("Original document content\n")
+        data = b"Original document content\n"
+        (src / "doc.txt").write_bytes(data)
         original_hash = sha256_of_file(src / "doc.txt")
 
         dst = tmp_path / "dst"
@@ -363,8 +357,8 @@ class TestCorruptionDetectionLocal:
         # Corrupt: replace with different content of same length
         copied.write_text("Replaced document content\n")
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "doc.txt", copied)
 
     def test_deleted_file(self, tmp_src, tmp_dst):
         """Deleting a copied file is detected during scan."""
@@ -373,21 +367,19 @@ class TestCorruptionDetectionLocal:
 
         root = tmp_dst / tmp_src.name
         # Verify all files exist first
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert (root / rel).exists()
+        dst_rels = {f.relative_to(root) for f in iter_files(root)}
+        assert {f.relative_to(tmp_src) for f in iter_files(tmp_src)} <= dst_rels
 
         # Delete one file
         (root / "hello.txt").unlink()
         assert not (root / "hello.txt").exists()
 
         # Remaining files still match
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                if rel != Path("hello.txt"):
-                    assert files_are_identical(f, root / rel)
+        pairs = [
+            (f, root / f.relative_to(tmp_src)) for f in iter_files(tmp_src)
+            if f.relative_to(tmp_src) != Path("hello.txt")
+        ]
+        assert all(files_identical_many(pairs))
 
     def test_empty_file_replaced_with_content(self, tmp_path):
         """Writing data to a previously empty file is detected."""
@@ -406,14 +398,15 @@ class TestCorruptionDetectionLocal:
         # Corrupt: put data in the empty file
         copied.write_bytes(b"no longer empty")
 
+        assert_corrupted(b"", copied)
         assert sha256_of_file(copied) != empty_hash
-        assert not files_are_identical(src / "empty", copied)
 
     def test_nonempty_file_replaced_with_empty(self, tmp_path):
         """Truncating a file to zero bytes is detected."""
         src = tmp_path / "src"
         src.mkdir()
-        (src / "data.bin").write_bytes(os.urandom(4096))
+        data = randbytes(4096)
+        (src / "data.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "data.bin")
 
         dst = tmp_path / "dst"
@@ -426,8 +419,8 @@ class TestCorruptionDetectionLocal:
         # Corrupt: truncate to zero
         copied.write_bytes(b"")
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "data.bin", copied)
 
     def test_corruption_in_nested_file(self, tmp_src, tmp_dst):
         """Corruption in a nested subdirectory file is detected."""
@@ -440,13 +433,13 @@ class TestCorruptionDetectionLocal:
         original_hash = sha256_of_file(tmp_src / "subdir" / "nested.txt")
         assert sha256_of_file(nested) == original_hash
 
+        original = nested.read_bytes()
+
         # Corrupt the nested file
         nested.write_text("CORRUPTED\n")
 
+        assert_corrupted(original, nested)
         assert sha256_of_file(nested) != original_hash
-        assert not files_are_identical(
-            tmp_src / "subdir" / "nested.txt", nested,
-        )
 
     def test_corruption_in_deeply_nested_file(self, tmp_src, tmp_dst):
         """Corruption two levels deep is detected."""
@@ -460,8 +453,8 @@ class TestCorruptionDetectionLocal:
 
         deep.write_text("TAMPERED\n")
 
+        assert_corrupted(src_deep.read_bytes(), deep)
         assert not files_are_identical(src_deep, deep)
-        assert sha256_of_file(src_deep) != sha256_of_file(deep)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -476,7 +469,7 @@ class TestCorruptionDetectionRsync:
     def test_rsync_single_byte_flip(self, tmp_path):
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(50_000)
+        data = randbytes(50_000)
         (src / "big.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "big.bin")
 
@@ -487,17 +480,15 @@ class TestCorruptionDetectionRsync:
         copied = dst / "src" / "big.bin"
         assert sha256_of_file(copied) == original_hash
 
-        corrupted = bytearray(copied.read_bytes())
-        corrupted[0] ^= 0x01
-        copied.write_bytes(bytes(corrupted))
+        flip_byte(copied, 0, 0x01)
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "big.bin", copied)
 
     def test_rsync_truncated_file(self, tmp_path):
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(20_000)
+        data = randbytes(20_000)
         (src / "file.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "file.bin")
 
@@ -510,8 +501,8 @@ class TestCorruptionDetectionRsync:
 
         copied.write_bytes(data[:100])
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
-        assert not files_are_identical(src / "file.bin", copied)
 
     def test_rsync_file_replaced(self, tmp_src, tmp_dst):
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync")
@@ -523,10 +514,8 @@ class TestCorruptionDetectionRsync:
 
         (root / "hello.txt").write_text("COMPLETELY DIFFERENT\n")
 
+        assert_corrupted((tmp_src / "hello.txt").read_bytes(), root / "hello.txt")
         assert sha256_of_file(root / "hello.txt") != original_hash
-        assert not files_are_identical(
-            tmp_src / "hello.txt", root / "hello.txt",
-        )
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -543,9 +532,8 @@ class TestCorruptionDetectionMove:
     def test_move_then_corrupt(self, tmp_path):
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(8192)
+        data, original_hash = random_blob(8192)
         (src / "important.bin").write_bytes(data)
-        original_hash = hashlib.sha256(data).hexdigest()
 
         dst = tmp_path / "dst"
         result = run_kosmokopy(src=src, dst=dst, move=True)
@@ -556,35 +544,31 @@ class TestCorruptionDetectionMove:
         assert sha256_of_file(copied) == original_hash
 
         # Corrupt the moved file
-        corrupted = bytearray(copied.read_bytes())
-        corrupted[-1] ^= 0xFF
-        copied.write_bytes(bytes(corrupted))
+        flip_byte(copied, -1)
 
+        assert_corrupted(data, copied)
         assert sha256_of_file(copied) != original_hash
 
-    def test_move_multiple_then_corrupt_one(self, tmp_src, tmp_dst):
+    def test_move_multiple_then_corrupt_one(self, tmp_src, tmp_dst, session_src_hashes):
         """Corrupting one file among many is pinpointed."""
-        originals = {}
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                originals[f.relative_to(tmp_src)] = sha256_of_file(f)
+        originals = session_src_hashes
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, move=True)
         assert result["status"] == "finished"
 
         root = tmp_dst / tmp_src.name
         # Verify all intact
-        for rel, h in originals.items():
-            assert sha256_of_file(root / rel) == h
+        assert sha256_tree(root) == originals
 
         # Corrupt just one
         target = root / "hello.txt"
         target.write_text("CORRUPTED\n")
 
+        after = sha256_tree(root)
         corrupted_count = 0
         intact_count = 0
         for rel, h in originals.items():
-            if sha256_of_file(root / rel) != h:
+            if after.get(rel) != h:
                 corrupted_count += 1
             else:
                 intact_count += 1
@@ -639,10 +623,7 @@ class TestCorruptionDetectionStripSpaces:
         assert result["status"] == "finished"
 
         # Collect hashes of all destination files
-        dst_hashes = {}
-        for f in tmp_dst.rglob("*"):
-            if f.is_file():
-                dst_hashes[f.relative_to(tmp_dst)] = sha256_of_file(f)
+        dst_hashes = sha256_tree(tmp_dst)
 
         assert len(dst_hashes) >= 1
 
@@ -666,7 +647,7 @@ class TestHashHelperSelfTest:
     """
 
     def test_identical_files_match(self, tmp_path):
-        data = os.urandom(4096)
+        data = b"A" * 4096
         (tmp_path / "a").write_bytes(data)
         (tmp_path / "b").write_bytes(data)
 
@@ -674,8 +655,8 @@ class TestHashHelperSelfTest:
         assert files_are_identical(tmp_path / "a", tmp_path / "b")
 
     def test_different_files_mismatch(self, tmp_path):
-        (tmp_path / "a").write_bytes(os.urandom(4096))
-        (tmp_path / "b").write_bytes(os.urandom(4096))
+        (tmp_path / "a").write_bytes(b"A" * 4096)
+        (tmp_path / "b").write_bytes(b"B" * 4096)
 
         assert sha256_of_file(tmp_path / "a") != sha256_of_file(tmp_path / "b")
         assert not files_are_identical(tmp_path / "a", tmp_path / "b")
@@ -714,6 +695,51 @@ class TestHashHelperSelfTest:
         assert files_are_identical(tmp_path / "a", tmp_path / "b")
         assert sha256_of_file(tmp_path / "a") == sha256_of_file(tmp_path / "b")
 
+    @pytest.mark.parametrize("size", [13, 8192, 200_000])
+    def test_assert_corrupted_rejects_intact_file(self, tmp_path, size):
+        data = randbytes(size)
+        (tmp_path / "a").write_bytes(data)
+
+        with pytest.raises(AssertionError):
+            assert_corrupted(data, tmp_path / "a")
+        assert_corrupted(data[:-1] + bytes([data[-1] ^ 1]), tmp_path / "a")
+
+    def test_rewrite_is_rehashed(self, tmp_path):
+        """Rewriting a file is seen by the next hash."""
+        f = tmp_path / "a"
+        f.write_bytes(b"\x00" * 1024)
+        before = sha256_of_file(f)
+        with open(f, "ab") as fh:
+            fh.write(b"\x00")
+
+        assert sha256_of_file(f) != before
+        assert sha256_of_file(f) == hashlib.sha256(b"\x00" * 1025).hexdigest()
+
+    def test_memo_rehashes_after_mtime_or_size_change(self, tmp_path, monkeypatch):
+        """A memoized source file is hashed afresh once its mtime or size moves."""
+        monkeypatch.setattr(conftest, "_IMMUTABLE_ROOTS", [])
+        monkeypatch.setattr(conftest, "_SHA256_CACHE", {})
+        _register_immutable_tree(tmp_path)
+        f = tmp_path / "a"
+        f.write_bytes(b"A" * 4096)
+        st = f.stat()
+
+        assert sha256_of_file(f) == hashlib.sha256(b"A" * 4096).hexdigest()
+        assert sha256_of_file(f) == hashlib.sha256(b"A" * 4096).hexdigest()
+        assert len(conftest._SHA256_CACHE) == 1
+
+        # Same size, different mtime
+        later = st.st_mtime_ns + 10 ** 9
+        f.write_bytes(b"B" * 4096)
+        os.utime(f, ns=(st.st_atime_ns, later))
+        assert sha256_of_file(f) == hashlib.sha256(b"B" * 4096).hexdigest()
+
+        # Same mtime, different size
+        f.write_bytes(b"C" * 4097)
+        os.utime(f, ns=(st.st_atime_ns, later))
+        assert sha256_of_file(f) == hashlib.sha256(b"C" * 4097).hexdigest()
+        assert len(conftest._SHA256_CACHE) == 3
+
 
 # ═══════════════════════════════════════════════════════════════════════
 #  NEGATIVE tests — corruption detection (remote upload)
@@ -732,7 +758,7 @@ class TestCorruptionDetectionRemoteUpload:
         host, rdir = remote_dest
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(8192)
+        data = randbytes(8192)
         (src / "test.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "test.bin")
 
@@ -743,20 +769,17 @@ class TestCorruptionDetectionRemoteUpload:
         assert sha256_remote(host, rdir + "/src/test.bin") == original_hash
 
         # Corrupt remotely: append a byte
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [host,
-             "printf '\\x00' >> " + _sq(rdir + "/src/test.bin")],
-            check=True, capture_output=True,
-        )
+        target = rdir + "/src/test.bin"
+        after = remote_mutate_and_hash(host, target, "printf '\\x00' >> " + _sq(target))
 
-        assert sha256_remote(host, rdir + "/src/test.bin") != original_hash
+        assert after != original_hash
 
     def test_upload_then_truncate_remote(self, tmp_path, remote_dest):
         """Truncating a remote file after upload is detected."""
         host, rdir = remote_dest
         src = tmp_path / "src"
         src.mkdir()
-        data = os.urandom(10_000)
+        data = randbytes(10_000)
         (src / "big.bin").write_bytes(data)
         original_hash = sha256_of_file(src / "big.bin")
 
@@ -765,13 +788,10 @@ class TestCorruptionDetectionRemoteUpload:
         assert sha256_remote(host, rdir + "/src/big.bin") == original_hash
 
         # Truncate remotely
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [host,
-             "truncate -s 100 " + _sq(rdir + "/src/big.bin")],
-            check=True, capture_output=True,
-        )
+        target = rdir + "/src/big.bin"
+        after = remote_mutate_and_hash(host, target, "truncate -s 100 " + _sq(target))
 
-        assert sha256_remote(host, rdir + "/src/big.bin") != original_hash
+        assert after != original_hash
 
     def test_upload_then_replace_remote(self, tmp_path, remote_dest):
         """Replacing remote file content entirely is detected."""
@@ -786,13 +806,10 @@ class TestCorruptionDetectionRemoteUpload:
         assert sha256_remote(host, rdir + "/src/doc.txt") == original_hash
 
         # Replace remotely
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [host,
-             "echo 'CORRUPTED' > " + _sq(rdir + "/src/doc.txt")],
-            check=True, capture_output=True,
-        )
+        target = rdir + "/src/doc.txt"
+        after = remote_mutate_and_hash(host, target, "echo 'CORRUPTED' > " + _sq(target))
 
-        assert sha256_remote(host, rdir + "/src/doc.txt") != original_hash
+        assert after != original_hash
 
     def test_upload_then_delete_remote(self, tmp_path, remote_dest):
         """Deleting a remote file after upload means it no longer exists."""
@@ -806,42 +823,35 @@ class TestCorruptionDetectionRemoteUpload:
         assert remote_file_exists(host, rdir + "/src/remove_me.txt")
 
         # Delete remotely
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [host,
-             "rm " + _sq(rdir + "/src/remove_me.txt")],
-            check=True, capture_output=True,
-        )
+        remote_run(host, "rm " + _sq(rdir + "/src/remove_me.txt")).check_returncode()
 
         assert not remote_file_exists(host, rdir + "/src/remove_me.txt")
 
-    def test_upload_multiple_corrupt_one_remote(self, tmp_src, remote_dest):
+    def test_upload_multiple_corrupt_one_remote(self, tmp_src, remote_dest, session_src_hashes):
         """Corrupting one of several uploaded files is pinpointed."""
         host, rdir = remote_dest
 
-        originals = {}
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                originals[f.relative_to(tmp_src)] = sha256_of_file(f)
+        originals = session_src_hashes
 
         result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
         assert result["status"] == "finished"
 
+        remote_paths = {
+            rel: "{}/{}/{}".format(rdir, tmp_src.name, rel.as_posix()) for rel in originals
+        }
+
         # Verify all intact
+        remote = sha256_remote_many(host, remote_paths.values())
         for rel, h in originals.items():
-            remote_path = "{}/{}/{}".format(rdir, tmp_src.name, rel)
-            assert sha256_remote(host, remote_path) == h
+            assert remote.get(remote_paths[rel]) == h
 
         # Corrupt just hello.txt
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [host,
-             "echo 'CORRUPT' > " + _sq(rdir + "/" + tmp_src.name + "/hello.txt")],
-            check=True, capture_output=True,
-        )
+        remote_run(host, "echo 'CORRUPT' > " + _sq(rdir + "/" + tmp_src.name + "/hello.txt")).check_returncode()
 
         corrupted_count = 0
+        remote = sha256_remote_many(host, remote_paths.values())
         for rel, h in originals.items():
-            remote_path = "{}/{}/{}".format(rdir, tmp_src.name, rel)
-            if sha256_remote(host, remote_path) != h:
+            if remote.get(remote_paths[rel]) != h:
                 corrupted_count += 1
 
         assert corrupted_count == 1
@@ -5,7 +5,6 @@ Operations are performed by invoking ``kosmokopy --cli``.
 Verification is done in Python.
 """
 
-import os
 from pathlib import Path
 
 import pytest
@@ -14,7 +13,11 @@ from conftest import (
     run_kosmokopy,
     requires_rsync,
     sha256_of_file,
+    sha256_tree,
     files_are_identical,
+    files_identical_many,
+    iter_files,
+    randbytes,
 )
 
 
@@ -37,36 +40,34 @@ class TestLocalCopyStandard:
         assert all(f.is_file() for f in dst_files)
         assert len(dst_files) == 6
 
-    def test_copy_preserve_structure(self, tmp_src, tmp_dst):
+    def test_copy_preserve_structure(self, copied_tree):
         """FoldersAndFiles mode: directory structure is preserved."""
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, mode="folders")
+        tmp_src, tmp_dst, result = copied_tree
         assert result["status"] == "finished"
         assert result["copied"] == 6
 
         root = tmp_dst / tmp_src.name  # root folder preserved
-        assert root.exists()
-        assert (root / "hello.txt").exists()
-        assert (root / "subdir" / "nested.txt").exists()
-        assert (root / "subdir" / "level2" / "bottom.txt").exists()
+        assert root.is_dir()
+        rel_src = {f.relative_to(tmp_src) for f in iter_files(tmp_src)}
+        rel_dst = {f.relative_to(root) for f in iter_files(root)}
+        assert rel_dst == rel_src
+        assert {
+            Path("hello.txt"),
+            Path("subdir", "nested.txt"),
+            Path("subdir", "level2", "bottom.txt"),
+        } <= rel_dst
 
         # Verify content integrity
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                dst_f = root / rel
-                assert dst_f.exists()
-                assert files_are_identical(f, dst_f)
-
-    def test_copy_verifies_integrity(self, tmp_src, tmp_dst):
+        pairs = [(tmp_src / rel, root / rel) for rel in sorted(rel_src)]
+        for (f, _), same in zip(pairs, files_identical_many(pairs)):
+            assert same, "Mismatch for {}".format(f)
+
+    def test_copy_verifies_integrity(self, copied_tree, session_src_hashes):
         """After copy, SHA-256 hashes match."""
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst)
+        tmp_src, tmp_dst, result = copied_tree
         assert result["status"] == "finished"
 
-        root = tmp_dst / tmp_src.name
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert sha256_of_file(f) == sha256_of_file(root / rel)
+        assert sha256_tree(tmp_dst / tmp_src.name) == session_src_hashes
 
     def test_copy_creates_destination_dir(self, tmp_src, tmp_path):
         """Destination directory is created if it doesn't exist."""
@@ -115,9 +116,9 @@ class TestLocalCopyStandard:
         root = dst / "MyRootFolder"
         assert root.is_dir(), "Root folder not preserved in destination"
         assert (root / "a.txt").exists()
-        assert (root / "a.txt").read_text() == "aaa\n"
+        assert (root / "a.txt").read_bytes() == b"aaa\n"
         assert (root / "child" / "b.txt").exists()
-        assert (root / "child" / "b.txt").read_text() == "bbb\n"
+        assert (root / "child" / "b.txt").read_bytes() == b"bbb\n"
 
         # Files must NOT appear directly in dst (the old buggy behavior)
         assert not (dst / "a.txt").exists(), "File landed flat — root folder lost"
@@ -134,7 +135,7 @@ class TestLocalMoveStandard:
     def test_move_removes_source(self, tmp_src, tmp_dst):
         """After move, source files no longer exist."""
         src_file = tmp_src / "hello.txt"
-        original_content = src_file.read_text()
+        original_content = src_file.read_bytes()
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, move=True)
         assert result["status"] == "finished"
@@ -144,21 +145,20 @@ class TestLocalMoveStandard:
         # Source files gone
         assert not src_file.exists()
         # Dest has the content
-        assert (root / "hello.txt").read_text() == original_content
+        assert (root / "hello.txt").read_bytes() == original_content
 
     def test_move_preserves_structure(self, tmp_src, tmp_dst):
         """Move with FoldersAndFiles preserves directory layout."""
         # Record original filenames
-        originals = {f.relative_to(tmp_src) for f in tmp_src.rglob("*") if f.is_file()}
+        originals = {f.relative_to(tmp_src) for f in iter_files(tmp_src)}
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, move=True)
         assert result["status"] == "finished"
 
         root = tmp_dst / tmp_src.name
         # All originals should be in dst, not in src
-        for rel in originals:
-            assert (root / rel).exists()
-            assert not (tmp_src / rel).exists()
+        assert {f.relative_to(root) for f in iter_files(root)} == originals
+        assert list(iter_files(tmp_src)) == []
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -169,8 +169,8 @@ class TestLocalMoveStandard:
 @requires_rsync
 class TestLocalCopyRsync:
 
-    def test_rsync_copy_preserve_structure(self, tmp_src, tmp_dst):
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync")
+    def test_rsync_copy_preserve_structure(self, copied_tree_rsync):
+        tmp_src, tmp_dst, result = copied_tree_rsync
         assert result["status"] == "finished"
         assert result["copied"] == 6
 
@@ -178,16 +178,12 @@ class TestLocalCopyRsync:
         assert (root / "subdir" / "nested.txt").exists()
         assert (root / "subdir" / "level2" / "bottom.txt").exists()
 
-    def test_rsync_checksum_verification(self, tmp_src, tmp_dst):
+    def test_rsync_checksum_verification(self, copied_tree_rsync, session_src_hashes):
         """rsync transfers match SHA-256 hashes."""
-        result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync")
+        tmp_src, tmp_dst, result = copied_tree_rsync
         assert result["status"] == "finished"
 
-        root = tmp_dst / tmp_src.name
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert sha256_of_file(f) == sha256_of_file(root / rel)
+        assert sha256_tree(tmp_dst / tmp_src.name) == session_src_hashes
 
     def test_rsync_flat_mode(self, tmp_src, tmp_dst):
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync", mode="files")
@@ -200,18 +196,16 @@ class TestLocalCopyRsync:
 @requires_rsync
 class TestLocalMoveRsync:
 
-    def test_rsync_move(self, tmp_src, tmp_dst):
-        originals = {f.relative_to(tmp_src): sha256_of_file(f)
-                     for f in tmp_src.rglob("*") if f.is_file()}
+    def test_rsync_move(self, tmp_src, tmp_dst, session_src_hashes):
+        originals = session_src_hashes
 
         result = run_kosmokopy(src=tmp_src, dst=tmp_dst, method="rsync", move=True)
         assert result["status"] == "finished"
         assert result["copied"] == 6
 
         root = tmp_dst / tmp_src.name
-        for rel, h in originals.items():
-            assert not (tmp_src / rel).exists()
-            assert sha256_of_file(root / rel) == h
+        assert list(iter_files(tmp_src)) == []
+        assert sha256_tree(root) == originals
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -229,10 +223,8 @@ class TestStripSpaces:
         assert result["copied"] == 3
 
         # Spaces removed from all path components
-        for f in tmp_dst.rglob("*"):
-            if f.is_file():
-                for part in f.relative_to(tmp_dst).parts:
-                    assert " " not in part
+        rels = [str(f.relative_to(tmp_dst)) for f in iter_files(tmp_dst)]
+        assert [r for r in rels if " " in r] == []
 
     def test_strip_spaces_flat(self, tmp_src_with_spaces, tmp_dst):
         result = run_kosmokopy(
@@ -280,7 +272,7 @@ class TestSingleFileCopy:
         src = tmp_path / "src"
         src.mkdir()
         f = src / "only.bin"
-        f.write_bytes(os.urandom(1024))
+        f.write_bytes(randbytes(1024))
         dst = tmp_path / "dst"
 
         result = run_kosmokopy(src_files=[f], dst=dst, mode="files", method="rsync")
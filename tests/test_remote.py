@@ -5,12 +5,9 @@ All file operations are performed through ``kosmokopy --cli``.
 Results are verified in Python via SSH helper functions.
 """
 
-import os
-import subprocess
+import uuid
 from pathlib import Path
 
-import pytest
-
 from conftest import (
     run_kosmokopy,
     requires_remote,
@@ -18,12 +15,13 @@ from conftest import (
     requires_rsync,
     sha256_of_file,
     sha256_remote,
-    remote_file_exists,
+    sha256_tree_remote,
+    assert_matches_remote,
+    iter_files,
     remote_ls,
     remote_read,
     remote_rm_rf,
-    SSH_CTL,
-    _sq,
+    remote_write_file,
     REMOTE_HOST,
     REMOTE_PATH,
     REMOTE_HOST2,
@@ -40,40 +38,35 @@ from conftest import (
 class TestLocalToRemoteSCP:
     """Upload from local directory to a remote host via standard method."""
 
-    def test_basic_upload(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
+    def test_basic_upload(self, uploaded_tree):
+        tmp_src, host, rdir, result = uploaded_tree
 
         assert result["status"] == "finished"
         assert result["errors"] == []
         assert result["copied"] >= 1
 
-    def test_upload_file_count(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        local_count = sum(1 for f in tmp_src.rglob("*") if f.is_file())
+    def test_upload_file_count(self, uploaded_tree, session_src_hashes):
+        tmp_src, host, rdir, result = uploaded_tree
+        local_count = len(session_src_hashes)
 
-        result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
         assert result["copied"] == local_count
 
-    def test_upload_preserves_content(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
+    def test_upload_preserves_content(self, uploaded_tree, session_src_hashes):
+        tmp_src, host, rdir, result = uploaded_tree
         assert result["status"] == "finished"
 
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                remote_path = "{}/{}/{}".format(rdir, tmp_src.name, rel)
-                assert sha256_of_file(f) == sha256_remote(host, remote_path)
+        assert_matches_remote(
+            tmp_src, host, "{}/{}".format(rdir, tmp_src.name), session_src_hashes,
+        )
 
-    def test_upload_nested_dirs(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        result = run_kosmokopy(src=tmp_src, dst="{}:{}".format(host, rdir))
+    def test_upload_nested_dirs(self, uploaded_tree):
+        tmp_src, host, rdir, result = uploaded_tree
         assert result["status"] == "finished"
 
         root = "{}/{}".format(rdir, tmp_src.name)
-        assert remote_file_exists(host, root + "/subdir/nested.txt")
-        assert remote_file_exists(host, root + "/subdir/level2/bottom.txt")
+        files = set(remote_ls(host, rdir))
+        assert root + "/subdir/nested.txt" in files
+        assert root + "/subdir/level2/bottom.txt" in files
 
     def test_upload_selected_files(self, tmp_src, remote_dest):
         host, rdir = remote_dest
@@ -84,8 +77,9 @@ class TestLocalToRemoteSCP:
         assert result["status"] == "finished"
         assert result["copied"] == 2
 
-        assert remote_file_exists(host, rdir + "/hello.txt")
-        assert remote_file_exists(host, rdir + "/data.bin")
+        files = set(remote_ls(host, rdir))
+        assert rdir + "/hello.txt" in files
+        assert rdir + "/data.bin" in files
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -97,28 +91,19 @@ class TestLocalToRemoteSCP:
 @requires_rsync
 class TestLocalToRemoteRsync:
 
-    def test_basic_upload(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        result = run_kosmokopy(
-            src=tmp_src, dst="{}:{}".format(host, rdir), method="rsync",
-        )
+    def test_basic_upload(self, uploaded_tree_rsync):
+        tmp_src, host, rdir, result = uploaded_tree_rsync
         assert result["status"] == "finished"
         assert result["errors"] == []
         assert result["copied"] >= 1
 
-    def test_upload_content_match(self, tmp_src, remote_dest):
-        host, rdir = remote_dest
-        result = run_kosmokopy(
-            src=tmp_src, dst="{}:{}".format(host, rdir), method="rsync",
-        )
+    def test_upload_content_match(self, uploaded_tree_rsync, session_src_hashes):
+        tmp_src, host, rdir, result = uploaded_tree_rsync
         assert result["status"] == "finished"
 
-        for f in tmp_src.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(tmp_src)
-                assert sha256_of_file(f) == sha256_remote(
-                    host, "{}/{}/{}".format(rdir, tmp_src.name, rel),
-                )
+        assert_matches_remote(
+            tmp_src, host, "{}/{}".format(rdir, tmp_src.name), session_src_hashes,
+        )
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -130,35 +115,22 @@ class TestLocalToRemoteRsync:
 class TestRemoteToLocalSCP:
     """Download from remote source to local destination."""
 
-    def test_basic_download(self, remote_src, tmp_path):
-        host, rdir = remote_src
-        dst = tmp_path / "dst"
-
-        result = run_kosmokopy(src="{}:{}".format(host, rdir), dst=dst)
+    def test_basic_download(self, downloaded_tree):
+        host, rdir, dst, result = downloaded_tree
         assert result["status"] == "finished"
         assert result["errors"] == []
         assert result["copied"] >= 1
 
-    def test_download_preserves_content(self, remote_src, tmp_path):
-        host, rdir = remote_src
-        dst = tmp_path / "dst"
-
-        result = run_kosmokopy(src="{}:{}".format(host, rdir), dst=dst)
+    def test_download_preserves_content(self, downloaded_tree):
+        host, rdir, dst, result = downloaded_tree
         assert result["status"] == "finished"
 
         root_name = Path(rdir).name
         root = dst / root_name
-        for f in root.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(root)
-                remote_path = "{}/{}".format(rdir, rel)
-                assert sha256_of_file(f) == sha256_remote(host, remote_path)
-
-    def test_download_nested(self, remote_src, tmp_path):
-        host, rdir = remote_src
-        dst = tmp_path / "dst"
+        assert_matches_remote(root, host, rdir)
 
-        result = run_kosmokopy(src="{}:{}".format(host, rdir), dst=dst)
+    def test_download_nested(self, downloaded_tree):
+        host, rdir, dst, result = downloaded_tree
         assert result["status"] == "finished"
 
         root_name = Path(rdir).name
@@ -177,22 +149,10 @@ class TestRemoteSingleFileDownload:
 
     def test_download_single_remote_file(self, tmp_path):
         """Create one file on the remote, download it, verify content."""
-        if not (REMOTE_HOST and REMOTE_PATH):
-            pytest.skip("Remote host not configured")
-
-        import subprocess as sp
         test_dir = "{}/single_file_test_{}".format(
-            REMOTE_PATH.rstrip("/"), id(object()),
-        )
-        sp.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(test_dir)],
-            check=True, capture_output=True,
-        )
-        sp.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST,
-             "echo 'single file content' > " + _sq(test_dir + "/only.txt")],
-            check=True, capture_output=True,
+            REMOTE_PATH.rstrip("/"), uuid.uuid4().hex[:12],
         )
+        remote_write_file(REMOTE_HOST, test_dir, "only.txt", "single file content")
 
         try:
             dst = tmp_path / "dst"
@@ -208,27 +168,13 @@ class TestRemoteSingleFileDownload:
         finally:
             remote_rm_rf(REMOTE_HOST, test_dir)
 
+    @requires_rsync
     def test_download_single_remote_file_rsync(self, tmp_path):
         """Same as above but via rsync method."""
-        if not (REMOTE_HOST and REMOTE_PATH):
-            pytest.skip("Remote host not configured")
-        import shutil
-        if shutil.which("rsync") is None:
-            pytest.skip("rsync not installed")
-
-        import subprocess as sp
         test_dir = "{}/single_rsync_test_{}".format(
-            REMOTE_PATH.rstrip("/"), id(object()),
-        )
-        sp.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(test_dir)],
-            check=True, capture_output=True,
-        )
-        sp.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST,
-             "echo 'rsync single' > " + _sq(test_dir + "/rsingle.txt")],
-            check=True, capture_output=True,
+            REMOTE_PATH.rstrip("/"), uuid.uuid4().hex[:12],
         )
+        remote_write_file(REMOTE_HOST, test_dir, "rsingle.txt", "rsync single")
 
         try:
             dst = tmp_path / "dst"
@@ -278,33 +224,19 @@ class TestRemoteSingleFileUpload:
 @requires_rsync
 class TestRemoteToLocalRsync:
 
-    def test_basic_download(self, remote_src, tmp_path):
-        host, rdir = remote_src
-        dst = tmp_path / "dst"
-
-        result = run_kosmokopy(
-            src="{}:{}".format(host, rdir), dst=dst, method="rsync",
-        )
+    def test_basic_download(self, downloaded_tree_rsync):
+        host, rdir, dst, result = downloaded_tree_rsync
         assert result["status"] == "finished"
         assert result["errors"] == []
         assert result["copied"] >= 1
 
-    def test_download_content_match(self, remote_src, tmp_path):
-        host, rdir = remote_src
-        dst = tmp_path / "dst"
-
-        result = run_kosmokopy(
-            src="{}:{}".format(host, rdir), dst=dst, method="rsync",
-        )
+    def test_download_content_match(self, downloaded_tree_rsync):
+        host, rdir, dst, result = downloaded_tree_rsync
         assert result["status"] == "finished"
 
         root_name = Path(rdir).name
         root = dst / root_name
-        for f in root.rglob("*"):
-            if f.is_file():
-                rel = f.relative_to(root)
-                remote_path = "{}/{}".format(rdir, rel)
-                assert sha256_of_file(f) == sha256_remote(host, remote_path)
+        assert_matches_remote(root, host, rdir)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -329,7 +261,7 @@ class TestRemoteToRemoteSCPRelay:
         assert result["errors"] == []
         assert result["copied"] >= 1
 
-    def test_relay_content_match(self, remote_src, remote_dest2):
+    def test_relay_content_match(self, remote_src, remote_dest2, ssh_pool):
         src_host, src_dir = remote_src
         dst_host, dst_dir = remote_dest2
 
@@ -340,12 +272,12 @@ class TestRemoteToRemoteSCPRelay:
         assert result["status"] == "finished"
 
         src_root = Path(src_dir).name
-        src_files = remote_ls(src_host, src_dir)
-        for full_path in src_files:
-            rel = os.path.relpath(full_path, src_dir)
-            src_hash = sha256_remote(src_host, full_path)
-            dst_hash = sha256_remote(dst_host, "{}/{}/{}".format(dst_dir, src_root, rel))
-            assert src_hash == dst_hash, "Hash mismatch for {}".format(rel)
+        # One list-and-hash round-trip per host, both hosts at once
+        src_pending = ssh_pool.submit(sha256_tree_remote, src_host, src_dir)
+        dst_hashes = sha256_tree_remote(dst_host, "{}/{}".format(dst_dir, src_root))
+        src_hashes = src_pending.result()
+        assert src_hashes, "Cannot hash source {}".format(src_dir)
+        assert dst_hashes == src_hashes
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -383,23 +315,13 @@ class TestRemoteToRemoteSingleFileSCP:
     """Transfer a single file between two remote hosts via SCP relay."""
 
     def test_relay_single_file(self, remote_dest2):
-        if not (REMOTE_HOST and REMOTE_PATH):
-            pytest.skip("Remote host not configured")
         dst_host, dst_dir = remote_dest2
 
         # Create a single file on the first remote host
         src_dir = "{}/r2r_single_scp_{}".format(
-            REMOTE_PATH.rstrip("/"), id(object()),
-        )
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(src_dir)],
-            check=True, capture_output=True,
-        )
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST,
-             "echo 'r2r single scp' > " + _sq(src_dir + "/one.txt")],
-            check=True, capture_output=True,
+            REMOTE_PATH.rstrip("/"), uuid.uuid4().hex[:12],
         )
+        remote_write_file(REMOTE_HOST, src_dir, "one.txt", "r2r single scp")
 
         try:
             result = run_kosmokopy(
@@ -425,22 +347,12 @@ class TestRemoteToRemoteSingleFileRsync:
     """Transfer a single file between two remote hosts via rsync relay."""
 
     def test_relay_single_file_rsync(self, remote_dest2):
-        if not (REMOTE_HOST and REMOTE_PATH):
-            pytest.skip("Remote host not configured")
         dst_host, dst_dir = remote_dest2
 
         src_dir = "{}/r2r_single_rsync_{}".format(
-            REMOTE_PATH.rstrip("/"), id(object()),
-        )
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST, "mkdir -p " + _sq(src_dir)],
-            check=True, capture_output=True,
-        )
-        subprocess.run(
-            ["ssh"] + SSH_CTL + [REMOTE_HOST,
-             "echo 'r2r single rsync' > " + _sq(src_dir + "/solo.txt")],
-            check=True, capture_output=True,
+            REMOTE_PATH.rstrip("/"), uuid.uuid4().hex[:12],
         )
+        remote_write_file(REMOTE_HOST, src_dir, "solo.txt", "r2r single rsync")
 
         try:
             result = run_kosmokopy(
@@ -478,9 +390,7 @@ class TestRealSourceToRemote:
         assert result["copied"] >= 1
 
         # Spot-check: at least one file matches
-        first_local = next(real_source.rglob("*"))
-        while first_local.is_dir():
-            first_local = next(real_source.rglob("*"))
+        first_local = next(iter_files(real_source))
         rel = first_local.relative_to(real_source)
         remote_path = "{}/{}/{}".format(rdir, real_source.name, rel)
         assert sha256_of_file(first_local) == sha256_remote(host, remote_path)
@@ -587,8 +497,9 @@ class TestRemoteConflicts:
         assert result["copied"] >= 1
 
         # Both should exist
-        assert remote_file_exists(host, rdir + "/src/file.txt")
-        assert remote_file_exists(host, rdir + "/src/file_1.txt")
+        files = set(remote_ls(host, rdir))
+        assert rdir + "/src/file.txt" in files
+        assert rdir + "/src/file_1.txt" in files
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -607,8 +518,9 @@ class TestRemoteExclusions:
             exclude=["/cache"],
         )
         assert result["status"] == "finished"
-        assert not remote_file_exists(host, rdir + "/source/cache/cached.dat")
-        assert remote_file_exists(host, rdir + "/source/keep.txt")
+        files = set(remote_ls(host, rdir))
+        assert rdir + "/source/cache/cached.dat" not in files
+        assert rdir + "/source/keep.txt" in files
 
     def test_wildcard_exclude_upload(self, tmp_src_with_exclusions, remote_dest):
         host, rdir = remote_dest
@@ -618,9 +530,10 @@ class TestRemoteExclusions:
             exclude=["~*.log", "~*.tmp"],
         )
         assert result["status"] == "finished"
-        assert not remote_file_exists(host, rdir + "/source/skip_me.log")
-        assert not remote_file_exists(host, rdir + "/source/data.tmp")
-        assert remote_file_exists(host, rdir + "/source/keep.txt")
+        files = set(remote_ls(host, rdir))
+        assert rdir + "/source/skip_me.log" not in files
+        assert rdir + "/source/data.tmp" not in files
+        assert rdir + "/source/keep.txt" in files
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -641,6 +554,7 @@ class TestStripSpacesRemote:
         assert result["status"] == "finished"
         assert result["errors"] == []
 
-        assert remote_file_exists(host, rdir + "/sourcespaces/myfile.txt")
-        assert remote_file_exists(host, rdir + "/sourcespaces/anotherdoc.pdf")
-        assert remote_file_exists(host, rdir + "/sourcespaces/subfolder/innerfile.txt")
+        files = set(remote_ls(host, rdir))
+        assert rdir + "/sourcespaces/myfile.txt" in files
+        assert rdir + "/sourcespaces/anotherdoc.pdf" in files
+        assert rdir + "/sourcespaces/subfolder/innerfile.txt" in files
@@ -0,0 +1,41 @@
+"""
+Scheduling tests.
+
+These check that ``pytest_collection_modifyitems`` in conftest queues the
+slow tests first on xdist workers and leaves a serial run in file order.
+No transfers are made.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from conftest import pytest_collection_modifyitems
+
+
+def _item(nodeid):
+    return SimpleNamespace(nodeid=nodeid, path=Path(nodeid.split("::")[0]))
+
+
+_NODEIDS = [
+    "tests/test_local.py::TestLocalCopy::test_copy",
+    "tests/test_remote.py::TestLocalToRemoteRsync::test_basic_upload",
+    "tests/test_local.py::TestLocalCopy::test_flat",
+    "tests/test_cancel.py::TestLocalCancelStandard::test_cancel_no_errors",
+]
+
+
+class TestSlowTestsFirst:
+    """Slow tests move to the front only where xdist collects."""
+
+    def test_worker_sorts_slow_tests_first(self):
+        items = [_item(n) for n in _NODEIDS]
+        config = SimpleNamespace(workerinput={"workerid": "gw0"})
+        pytest_collection_modifyitems(config, items)
+        assert [i.nodeid for i in items] == [
+            _NODEIDS[1], _NODEIDS[3], _NODEIDS[0], _NODEIDS[2],
+        ]
+
+    def test_serial_run_keeps_file_order(self):
+        items = [_item(n) for n in _NODEIDS]
+        pytest_collection_modifyitems(SimpleNamespace(), items)
+        assert [i.nodeid for i in items] == _NODEIDS